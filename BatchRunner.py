@@ -0,0 +1,161 @@
+from Fetcher import Fetcher
+from Info import read_titles, summarize_title
+from Lexicons import load_ignored_words, load_replacements
+from ResultCache import ResultCache
+from Sinks import CollectSink, FileSink, JsonLinesSink
+from Summarizer import RANKINGS, Summarizer
+from TextExtractor import EXTRACTORS
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+import argparse
+import os
+import sys
+
+summarizer = None
+fetcher = None
+extractor = "soup"
+threads = 4
+
+def init_worker(ignored_words, replacer, settings):
+	"""
+	Build the Summarizer and the Fetcher each worker process reuses for all of its shards.
+	The lexicons are handed over here, so they are sent to every worker only once.
+
+	Parameters:
+		1) ignored_words - set of words that are never keywords
+		2) replacer - Lexicons.Replacer used on abbreviations
+		3) settings - dict of the keyword_limit, sentence_limit, extractor, threads, result_cache_dir and summarizer options
+	"""
+
+	global summarizer, fetcher, extractor, threads
+	summarizer = Summarizer(None, settings["keyword_limit"], settings["sentence_limit"], ignored_words=ignored_words, replacer=replacer,
+		result_cache=ResultCache(directory=settings["result_cache_dir"]), **settings["options"])
+	fetcher = Fetcher()
+	extractor = settings["extractor"]
+	threads = settings["threads"]
+
+
+def summarize_shard(shard):
+	"""
+	Function run by the workers to summarize a shard of titles, a few at a time so
+	downloads overlap. Returns the title, the Result and the error message of every title.
+
+	Parameters:
+		1) shard - list of titles
+	"""
+
+	def summarize(title):
+		sink = CollectSink()
+		try:
+			summarize_title(title, sink, fetcher, extractor, summarizer)
+		except Exception as e:
+			return title, None, str(e)
+		return title, sink.results[0], None
+
+	with ThreadPoolExecutor(max_workers=threads) as executor:
+		return list(executor.map(summarize, shard))
+
+
+def read_checkpoint(path):
+	"""
+	Function that returns the titles a checkpoint records as done.
+
+	Parameters:
+		1) path - the checkpoint file, it does not need to exist
+	"""
+
+	if not os.path.exists(path):
+		return set()
+
+	with open(path, "r", encoding="utf-8") as f:
+		#A run killed mid write can leave a partial last line, it is simply done again
+		return set(line[:-1] for line in f if line.endswith("\n"))
+
+
+def run_sharded(titles, sink, checkpoint, processes=None, shard_size=64, threads=4, keyword_limit=25, sentence_limit=0.65,
+		extractor="soup", result_cache_dir=None, **options):
+	"""
+	Summarize many titles across a pool of worker processes, a shard of titles at a time.
+	Every finished title is added to the checkpoint once its result is written, so a run
+	started again with the same checkpoint skips them. Returns the number of titles that failed.
+
+	Parameters:
+		1) titles - the titles to query
+		2) sink - where every result is written, only this process writes to it
+		3) checkpoint - file the finished titles are appended to
+		4) processes - number of worker processes, defaults to the number of cores
+		5) shard_size - how many titles a worker is given at once
+		6) threads - titles a worker downloads at the same time
+		7) keyword_limit - use this many keywords when using algorithm
+		8) sentence_limit - floating percentange that limits the amount of sentences gathered
+		9) extractor - backend used to parse the pages
+		10) result_cache_dir - directory of the on-disk tier of the result cache, or None
+		11) options - extra Summarizer options such as ranking or vectorized
+	"""
+
+	done = read_checkpoint(checkpoint)
+	titles = [title for title in titles if title not in done]
+	shards = [titles[start:start + shard_size] for start in range(0, len(titles), shard_size)]
+	failures = 0
+
+	settings = {
+		"keyword_limit": keyword_limit,
+		"sentence_limit": sentence_limit,
+		"extractor": extractor,
+		"threads": threads,
+		"result_cache_dir": result_cache_dir,
+		"options": options,
+	}
+
+	print("{} titles already done, {} left in {} shards".format(len(done), len(titles), len(shards)), file=sys.stderr)
+
+	with Pool(processes, initializer=init_worker, initargs=(load_ignored_words(), load_replacements(), settings)) as pool, \
+			open(checkpoint, "a", encoding="utf-8") as progress:
+		for results in pool.imap_unordered(summarize_shard, shards):
+			finished = []
+
+			for title, result, error in results:
+				if error:
+					failures += 1
+					print("FAILED\t{}\t{}".format(title, error), file=sys.stderr)
+				else:
+					print("OK\t{}\t{}".format(title, sink.write(result)))
+					finished.append(title)
+
+			#Only record titles whose results are safely written
+			sink.flush()
+			progress.write("".join(title + "\n" for title in finished))
+			progress.flush()
+
+	return failures
+
+
+def main():
+	"""Driver function to summarize a long list of titles across processes."""
+	parser = argparse.ArgumentParser(description="Summarize a long list of wikipedia titles across worker processes, resuming from a checkpoint.")
+	parser.add_argument("titles", help="file with one title per line, '-' reads stdin")
+	parser.add_argument("--checkpoint", default="progress.txt", help="file recording the finished titles, a run with the same file resumes")
+	parser.add_argument("--processes", type=int, help="number of worker processes, defaults to the number of cores")
+	parser.add_argument("--shard-size", type=int, default=64, help="titles given to a worker at once")
+	parser.add_argument("--threads", type=int, default=4, help="titles a worker downloads at the same time")
+	parser.add_argument("--sink", choices=("files", "jsonl"), default="files", help="write a file per article or one JSON line per article")
+	parser.add_argument("--output-dir", default="summaries", help="directory for the summary files")
+	parser.add_argument("--jsonl", default="summaries.jsonl", help="file the jsonl sink appends to")
+	parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="soup", help="backend used to turn pages into text")
+	parser.add_argument("--result-cache-dir", help="keep finished summaries in this directory so unchanged text is not summarized again")
+	parser.add_argument("--ranking", choices=RANKINGS, default="keywords", help="pick the sentences with the most keywords or the most central ones by TextRank")
+	parser.add_argument("--vectorized", action="store_true", help="rank sentences with NumPy")
+	args = parser.parse_args()
+
+	sink = JsonLinesSink(args.jsonl) if args.sink == "jsonl" else FileSink(args.output_dir)
+
+	try:
+		failures = run_sharded(read_titles(args.titles), sink, args.checkpoint, args.processes, args.shard_size, args.threads,
+			extractor=args.extractor, result_cache_dir=args.result_cache_dir, ranking=args.ranking, vectorized=args.vectorized)
+	finally:
+		sink.close()
+
+	exit(1 if failures else 0)
+
+if __name__ == "__main__":
+	main()
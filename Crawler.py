@@ -0,0 +1,324 @@
+from Fetcher import Fetcher
+from HashSet import HashSet, key_hash
+from HttpCache import HttpCache
+from Info import Info, article_info, title_to_url
+from Sinks import FileSink, JsonLinesSink
+from Summarizer import Summarizer
+from TextExtractor import EXTRACTORS
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urljoin, urlsplit
+import argparse
+import sys
+import threading
+import time
+
+class TokenBucket:
+	"""
+	Class that lets requests through at a steady rate, with short bursts allowed.
+	Threads asking for a token while the bucket is empty wait until one is added.
+	"""
+
+	def __init__(self, rate, burst):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) rate - tokens added every second
+			2) burst - most tokens the bucket holds
+		"""
+
+		self.rate = rate
+		self.capacity = burst
+		self.tokens = burst
+		self.updated = time.monotonic()
+		self.lock = threading.Lock()
+
+
+	def acquire(self):
+		"""Take a token, waiting for one to be added if the bucket is empty."""
+
+		while True:
+			with self.lock:
+				now = time.monotonic()
+				self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+				self.updated = now
+
+				if self.tokens >= 1:
+					self.tokens -= 1
+					return
+
+				wait = (1 - self.tokens) / self.rate
+
+			time.sleep(wait)
+
+
+class HostLimiter:
+	"""Class that keeps one TokenBucket per host, so every site is only asked so often."""
+
+	def __init__(self, rate=2.0, burst=4):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) rate - requests per second allowed to one host
+			2) burst - requests one host may get at once after being idle
+		"""
+
+		self.rate = rate
+		self.burst = burst
+		self.buckets = {}
+		self.lock = threading.Lock()
+
+
+	def acquire(self, url):
+		"""
+		Wait until the host of a url may be asked again.
+
+		Parameters:
+			1) url - the url about to be fetched
+		"""
+
+		host = urlsplit(url).netloc
+
+		with self.lock:
+			if host not in self.buckets:
+				self.buckets[host] = TokenBucket(self.rate, self.burst)
+			bucket = self.buckets[host]
+
+		bucket.acquire()
+
+
+class VisitedSet:
+	"""
+	Class that remembers which pages were seen. Only an 8 byte hash of every page is kept,
+	in a HashSet that takes 12 to 24 bytes a page, so even a whole wiki fits in little
+	memory. Two pages sharing a hash is unlikely enough to be ignored.
+	"""
+
+	def __init__(self):
+		"""Initialization function for this class."""
+
+		self.hashes = HashSet()
+		self.lock = threading.Lock()
+
+
+	def add(self, key):
+		"""
+		Function that marks a page as seen, returning True if it was not seen before.
+
+		Parameters:
+			1) key - string naming the page
+		"""
+
+		value = key_hash(key)
+
+		with self.lock:
+			return self.hashes.add(value)
+
+
+	def __len__(self):
+		"""Function that returns how many pages were seen."""
+
+		return len(self.hashes)
+
+
+def article_links(page, url):
+	"""
+	Function that returns the urls of the articles of the same wiki a page links to,
+	in document order and without fragments or queries.
+
+	Parameters:
+		1) page - the TextExtractor.Page of the page
+		2) url - the url the page was fetched from
+	"""
+
+	host = urlsplit(url).netloc
+	links = []
+
+	for href in page.anchors:
+		parts = urlsplit(urljoin(url, href))
+		title = unquote(parts.path[6:])
+
+		#Namespaced pages such as File:, Talk: or Special: are not articles
+		if parts.netloc != host or not parts.path.startswith("/wiki/") or not title or ":" in title or title == "Main_Page":
+			continue
+
+		links.append("{}://{}{}".format(parts.scheme, parts.netloc, parts.path))
+
+	return links
+
+
+def page_key(url):
+	"""
+	Function that returns the name a page is deduplicated under, so differently quoted
+	urls of the same article count once.
+
+	Parameters:
+		1) url - url of the page
+	"""
+
+	parts = urlsplit(url)
+	return parts.netloc.lower() + unquote(parts.path)
+
+
+class Crawler:
+	"""
+	Class that summarizes a wiki breadth-first, starting from seed pages and following
+	the links to other articles of the same wiki up to a depth and a page budget.
+	Every page is summarized once, a page reached under another url such as a redirect
+	is recognised by its canonical url after it is fetched, and every host is only asked
+	as often as its token bucket allows.
+	"""
+
+	def __init__(self, sink, fetcher=None, summarizer=None, extractor="soup", max_depth=2, max_pages=100, workers=8, rate=2.0, burst=4):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) sink - where every result is written, see Sinks
+			2) fetcher - Fetcher shared by all the workers
+			3) summarizer - Summarizer shared by all the workers
+			4) extractor - backend used to parse the pages
+			5) max_depth - how many links away from the seeds pages are followed
+			6) max_pages - most pages summarized in the whole crawl
+			7) workers - most pages fetched at the same time
+			8) rate - requests per second allowed to one host
+			9) burst - requests one host may get at once after being idle
+		"""
+
+		self.sink = sink
+		self.fetcher = fetcher or Fetcher()
+		self.summarizer = summarizer or Summarizer(None, 25, 0.65)
+		self.extractor = extractor
+		self.max_depth = max_depth
+		self.max_pages = max_pages
+		self.workers = workers
+		self.limiter = HostLimiter(rate, burst)
+		self.visited = VisitedSet()
+
+
+	def crawl(self, seeds):
+		"""
+		Crawl from the seed urls one depth at a time. Returns the number of pages that failed.
+
+		Parameters:
+			1) seeds - urls of the pages to start from
+		"""
+
+		failures = 0
+		scheduled = 0
+		frontier = []
+
+		for url in seeds:
+			if scheduled < self.max_pages and self.visited.add(page_key(url)):
+				frontier.append(url)
+				scheduled += 1
+
+		with ThreadPoolExecutor(max_workers=self.workers) as executor:
+			for depth in range(self.max_depth + 1):
+				if not frontier:
+					break
+
+				next_frontier = []
+
+				#Pages of one depth are fetched together, their links make up the next depth
+				for url, output, links, error in executor.map(self.visit, frontier):
+					if error:
+						failures += 1
+						print("FAILED\t{}\t{}".format(url, error), file=sys.stderr)
+						continue
+
+					#Another url of the same article was already summarized
+					if output is None:
+						print("SEEN\t{}".format(url))
+						continue
+
+					print("OK\t{}\t{}".format(url, output))
+
+					if depth == self.max_depth:
+						continue
+
+					for link in links:
+						if scheduled >= self.max_pages:
+							break
+						if self.visited.add(page_key(link)):
+							next_frontier.append(link)
+							scheduled += 1
+
+				frontier = next_frontier
+
+		return failures
+
+
+	def visit(self, url):
+		"""
+		Function that summarizes one page and returns the url, what the sink returned,
+		the article links of the page and the error message if it failed. What the sink
+		returned is None when the canonical url of the page was already seen.
+
+		Parameters:
+			1) url - the page to summarize
+		"""
+
+		try:
+			self.limiter.acquire(url)
+			info = Info(url, 25, 0.65, None, self.fetcher, self.extractor, self.summarizer, None, self.sink, unquote(urlsplit(url).path[6:]))
+
+			#Redirects and other urls of an article are only known to be the same page once it is fetched
+			_, canonical = article_info(info.page)
+			if canonical and page_key(canonical) != page_key(url) and not self.visited.add(page_key(canonical)):
+				return url, None, [], None
+
+			info.run()
+
+		except Exception as e:
+			return url, None, [], str(e)
+
+		return url, info.output, article_links(info.page, url), None
+
+
+def seed_url(seed):
+	"""
+	Function that turns a seed into a url, titles are looked up on the english wikipedia.
+
+	Parameters:
+		1) seed - a title or a full url
+	"""
+
+	if seed.startswith("http://") or seed.startswith("https://"):
+		return seed
+
+	return title_to_url(seed.replace(" ", "_"))
+
+
+def main():
+	"""Driver function to crawl a wiki from seed titles."""
+	parser = argparse.ArgumentParser(description="Summarize a wiki by following article links from seed pages.")
+	parser.add_argument("seeds", nargs="+", help="titles or full urls of the pages to start from")
+	parser.add_argument("--depth", type=int, default=2, help="how many links away from the seeds pages are followed")
+	parser.add_argument("--max-pages", type=int, default=100, help="most pages summarized in the whole crawl")
+	parser.add_argument("--workers", type=int, default=8, help="most pages fetched at the same time")
+	parser.add_argument("--rate", type=float, default=2.0, help="requests per second allowed to one host")
+	parser.add_argument("--burst", type=int, default=4, help="requests one host may get at once after being idle")
+	parser.add_argument("--sink", choices=("files", "jsonl"), default="files", help="write a file per article or one JSON line per article")
+	parser.add_argument("--output-dir", default="summaries", help="directory for the summary files")
+	parser.add_argument("--jsonl", default="summaries.jsonl", help="file the jsonl sink appends to")
+	parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="soup", help="backend used to turn pages into text")
+	parser.add_argument("--cache-dir", help="keep downloaded pages in this directory and revalidate them on later runs")
+	args = parser.parse_args()
+
+	cache = HttpCache(args.cache_dir) if args.cache_dir else None
+	sink = JsonLinesSink(args.jsonl) if args.sink == "jsonl" else FileSink(args.output_dir)
+	crawler = Crawler(sink, Fetcher(cache), None, args.extractor, args.depth, args.max_pages, args.workers, args.rate, args.burst)
+
+	try:
+		failures = crawler.crawl([seed_url(seed) for seed in args.seeds])
+	finally:
+		sink.close()
+		if cache:
+			cache.flush()
+
+	exit(1 if failures else 0)
+
+if __name__ == "__main__":
+	main()
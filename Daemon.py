@@ -0,0 +1,143 @@
+from Info import new_fetcher, summarize_title
+from ResultCache import ResultCache
+from Sinks import CollectSink
+from Summarizer import Summarizer
+from TextExtractor import EXTRACTORS
+import argparse
+import json
+import os
+import socket
+import socketserver
+
+class Handler(socketserver.StreamRequestHandler):
+	"""
+	Class that answers the requests of one client connection. Every request is one JSON
+	line naming a title, and every answer is one JSON line with the result or the error.
+	"""
+
+	def handle(self):
+		"""Answer requests until the client closes the connection."""
+
+		for line in self.rfile:
+			try:
+				title = json.loads(line)["title"]
+				sink = CollectSink()
+				summarize_title(title, sink, self.server.fetcher, self.server.extractor, self.server.summarizer)
+				response = dict(sink.results[0].to_dict(), error=None)
+			except Exception as e:
+				response = {"error": str(e)}
+
+			self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+			self.wfile.flush()
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+	"""
+	Class that keeps a Summarizer with its lexicons and a Fetcher with its open connections
+	loaded between runs, and summarizes titles sent over a Unix socket. Each connection
+	is served by its own thread.
+	"""
+
+	daemon_threads = True
+
+	def __init__(self, path, extractor="soup", cache_dir=None, result_cache_dir=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) path - path of the Unix socket to listen on, a stale socket file is replaced but one a daemon listens on raises ValueError
+			2) extractor - backend used to parse the pages
+			3) cache_dir - directory of the page cache, or None
+			4) result_cache_dir - directory of the on-disk tier of the result cache, or None
+		"""
+
+		from HttpCache import HttpCache
+
+		if os.path.exists(path):
+			if listening(path):
+				raise ValueError("A daemon already listens on {}".format(path))
+
+			#Nothing answers, so the file was left behind by a daemon that is gone
+			os.unlink(path)
+
+		self.extractor = extractor
+		self.cache = HttpCache(cache_dir) if cache_dir else None
+		self.fetcher = new_fetcher(self.cache)
+		self.summarizer = Summarizer(None, 25, 0.65, result_cache=ResultCache(directory=result_cache_dir))
+
+		super().__init__(path, Handler)
+
+
+def listening(path):
+	"""
+	Function that returns whether a daemon accepts connections on a Unix socket, False
+	when the socket file is missing or nothing listens on it any more.
+
+	Parameters:
+		1) path - path of the Unix socket
+	"""
+
+	with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+		try:
+			client.connect(path)
+		except (ConnectionRefusedError, FileNotFoundError):
+			return False
+
+	return True
+
+
+def request(path, title, timeout=120):
+	"""
+	Function that has a running daemon summarize a title and returns its answer as a dict.
+	Raises ConnectionRefusedError or FileNotFoundError when no daemon listens on the socket,
+	and other OSErrors such as socket.timeout when the daemon does not answer.
+
+	Parameters:
+		1) path - path of the daemon's Unix socket
+		2) title - the title to summarize
+		3) timeout - seconds to wait for the answer
+	"""
+
+	with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+		client.settimeout(timeout)
+		client.connect(path)
+		client.sendall((json.dumps({"title": title}) + "\n").encode("utf-8"))
+
+		with client.makefile("rb") as f:
+			line = f.readline()
+
+	if not line:
+		raise ConnectionError("The daemon closed the connection")
+
+	return json.loads(line)
+
+
+def main():
+	"""Driver function to keep the summarizer loaded and serve titles over a Unix socket."""
+	parser = argparse.ArgumentParser(description="Keep the summarizer loaded and summarize titles sent by Info.py --daemon.")
+	parser.add_argument("--socket", default="summarizer.sock", help="path of the Unix socket to listen on")
+	parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="soup", help="backend used to turn pages into text")
+	parser.add_argument("--cache-dir", help="keep downloaded pages in this directory and revalidate them on later runs")
+	parser.add_argument("--result-cache-dir", help="keep finished summaries in this directory so unchanged text is not summarized again")
+	args = parser.parse_args()
+
+	try:
+		daemon = Daemon(args.socket, args.extractor, args.cache_dir, args.result_cache_dir)
+	except ValueError:
+		print("Please stop the daemon listening on {} first or choose another --socket!".format(args.socket))
+		exit(1)
+
+	print("Listening on {}".format(args.socket))
+
+	try:
+		daemon.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		daemon.server_close()
+		os.unlink(args.socket)
+		if daemon.cache:
+			daemon.cache.flush()
+
+if __name__ == "__main__":
+	main()
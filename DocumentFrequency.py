@@ -0,0 +1,162 @@
+from HashSet import HashSet, key_hash
+from array import array
+import math
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+#Magic, number of buckets, number of documents
+HEADER = struct.Struct("<4sIQ")
+MAGIC = b"SDF1"
+MAX_COUNT = 0xFFFFFFFF
+
+class DocumentFrequency:
+	"""
+	Class that counts in how many articles every word appears, for TF-IDF weights.
+
+	Words are hashed into a fixed array of 32 bit counters stored in a memory-mapped file,
+	so the index has the same small size however many words it sees, opens instantly and
+	a lookup is one hash and one array read. Words that share a bucket share a count,
+	which only makes rare words look a little more common.
+
+	Every document is counted once, however often it is summarized. The 8 byte hashes of
+	the documents already counted are kept next to the index in a file ending in
+	'.documents', one appended for every new document.
+
+	Several threads may share one instance. Only one process should add documents to a
+	file at a time.
+	"""
+
+	def __init__(self, path, buckets=1 << 20):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) path - file holding the index, created when it does not exist
+			2) buckets - number of counters of a new index, an existing file keeps its own
+		"""
+
+		self.path = path
+		self.lock = threading.Lock()
+
+		if not os.path.exists(path):
+			with open(path, "wb") as f:
+				f.write(HEADER.pack(MAGIC, buckets, 0))
+				f.truncate(HEADER.size + 4 * buckets)
+
+		self.file = open(path, "r+b")
+		self.map = mmap.mmap(self.file.fileno(), 0)
+
+		magic, self.buckets, _ = HEADER.unpack_from(self.map, 0)
+		if magic != MAGIC or len(self.map) != HEADER.size + 4 * self.buckets:
+			self.close()
+			raise ValueError("Not a document frequency index: {}".format(path))
+
+		self.counts = memoryview(self.map)[HEADER.size:].cast("I")
+
+		hashes = array("Q")
+		if os.path.exists(path + ".documents"):
+			with open(path + ".documents", "rb") as f:
+				data = f.read()
+			#A hash cut short by a crash is dropped
+			hashes.frombytes(data[:len(data) - len(data) % hashes.itemsize])
+
+		self.seen = HashSet(len(hashes) * 2)
+		for value in hashes:
+			self.seen.add(value)
+
+		self.seen_file = open(path + ".documents", "ab")
+
+
+	@property
+	def documents(self):
+		"""Number of documents added to the index."""
+
+		return HEADER.unpack_from(self.map, 0)[2]
+
+
+	def bucket(self, word):
+		"""
+		Function that returns the counter a word is stored in.
+
+		Parameters:
+			1) word - the word to look up
+		"""
+
+		return zlib.crc32(word.encode("utf-8")) % self.buckets
+
+
+	def frequency(self, word):
+		"""
+		Function that returns the number of documents a word appeared in.
+
+		Parameters:
+			1) word - the word to look up
+		"""
+
+		return self.counts[self.bucket(word)]
+
+
+	def idf(self, word):
+		"""
+		Function that returns the smoothed inverse document frequency of a word.
+
+		Parameters:
+			1) word - the word to look up
+		"""
+
+		return math.log((1 + self.documents) / (1 + self.frequency(word))) + 1
+
+
+	def add_document(self, words, name=None):
+		"""
+		Count one more document containing the given words, unless the same document was
+		counted before or it has no words. Returns whether the document was counted.
+
+		Parameters:
+			1) words - the words of the document, repeated words are counted once
+			2) name - what identifies the document, such as its url, None identifies it by its words
+		"""
+
+		words = set(words)
+		if not words:
+			return False
+
+		value = key_hash(name if name is not None else "\0".join(sorted(words)))
+		buckets = set(self.bucket(word) for word in words)
+
+		with self.lock:
+			if not self.seen.add(value):
+				return False
+
+			self.seen_file.write(value.to_bytes(8, "little"))
+
+			for bucket in buckets:
+				if self.counts[bucket] < MAX_COUNT:
+					self.counts[bucket] += 1
+
+			HEADER.pack_into(self.map, 0, MAGIC, self.buckets, self.documents + 1)
+
+		return True
+
+
+	def flush(self):
+		"""Write the changes to disk."""
+
+		with self.lock:
+			self.seen_file.flush()
+		self.map.flush()
+
+
+	def close(self):
+		"""Write the changes to disk and close the file."""
+
+		if hasattr(self, "counts"):
+			self.counts.release()
+		if hasattr(self, "seen_file"):
+			self.seen_file.close()
+		self.map.flush()
+		self.map.close()
+		self.file.close()
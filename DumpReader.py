@@ -0,0 +1,258 @@
+from Info import title_to_url
+from Sinks import FileSink, Result, output_path
+from Summarizer import Summarizer
+from multiprocessing import Pool
+import xml.etree.ElementTree as ElementTree
+import argparse
+import bz2
+import os
+import re
+import sys
+
+COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+REF = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+TEMPLATE = re.compile(r"\{\{[^{}]*\}\}")
+TABLE = re.compile(r"\{\|.*?\|\}", re.DOTALL)
+NAMESPACED_LINK = re.compile(r"\[\[(?:File|Image|Category|Media):[^\[\]]*(?:\[\[[^\[\]]*\]\][^\[\]]*)*\]\]", re.IGNORECASE)
+LINK = re.compile(r"\[\[(?:[^\[\]|]*\|)?([^\[\]]*)\]\]")
+EXTERNAL_LINK = re.compile(r"\[(?:https?|ftp)://[^\s\]]+\s*([^\]]*)\]")
+HEADING = re.compile(r"^=+.*?=+\s*$", re.MULTILINE)
+EMPHASIS = re.compile(r"'{2,}")
+TAG = re.compile(r"<[^>]+>")
+LIST_MARKER = re.compile(r"^[*#:;]+\s*", re.MULTILINE)
+
+def open_dump(path):
+	"""
+	Function that opens a MediaWiki XML dump, decompressing it on the fly when it ends in .bz2.
+
+	Parameters:
+		1) path - path of the dump
+	"""
+
+	if path.endswith(".bz2"):
+		return bz2.open(path, "rb")
+
+	return open(path, "rb")
+
+
+def local_name(tag):
+	"""
+	Function that strips the XML namespace from a tag.
+
+	Parameters:
+		1) tag - the tag name as reported by ElementTree
+	"""
+
+	return tag.rsplit("}", 1)[-1]
+
+
+def iter_pages(path):
+	"""
+	Generator that streams the articles of a dump as (title, wikitext) pairs. Only the main
+	namespace is read and redirects are skipped. Every page is discarded once it has been
+	read so memory stays flat however large the dump is.
+
+	Parameters:
+		1) path - path of the dump
+	"""
+
+	with open_dump(path) as dump:
+		context = ElementTree.iterparse(dump, events=("start", "end"))
+		_, root = next(context)
+
+		for event, element in context:
+			if event != "end" or local_name(element.tag) != "page":
+				continue
+
+			title = None
+			namespace = None
+			redirect = False
+			text = None
+
+			for child in element.iter():
+				name = local_name(child.tag)
+				if name == "title":
+					title = child.text
+				elif name == "ns":
+					namespace = child.text
+				elif name == "redirect":
+					redirect = True
+				elif name == "text":
+					text = child.text
+
+			root.clear()
+
+			if title and text and namespace in (None, "0") and not redirect:
+				yield title, text
+
+
+def wikitext_to_text(wikitext):
+	"""
+	Function that turns wikitext into plain text with one paragraph per line, the same
+	shape clean_text expects from a downloaded page.
+
+	Parameters:
+		1) wikitext - the markup of an article
+	"""
+
+	text = COMMENT.sub("", wikitext)
+	text = REF.sub("", text)
+
+	#Templates nest, so remove the innermost ones until none are left
+	count = 1
+	while count:
+		text, count = TEMPLATE.subn("", text)
+
+	text = TABLE.sub("", text)
+	text = NAMESPACED_LINK.sub("", text)
+	text = LINK.sub(r"\1", text)
+	text = EXTERNAL_LINK.sub(r"\1", text)
+	text = HEADING.sub("", text)
+	text = EMPHASIS.sub("", text)
+	text = TAG.sub("", text)
+	text = LIST_MARKER.sub("", text)
+
+	return text
+
+
+summarizer = None
+
+def init_worker(keyword_limit, sentence_limit, vectorized=False):
+	"""
+	Build the Summarizer each worker process reuses for all of its articles.
+
+	Parameters:
+		1) keyword_limit - use this many keywords when using algorithm
+		2) sentence_limit - floating percentange that limits the amount of sentences gathered
+		3) vectorized - rank sentences with NumPy
+	"""
+
+	global summarizer
+	summarizer = Summarizer(None, keyword_limit, sentence_limit, vectorized=vectorized)
+
+
+def summarize_page(job):
+	"""
+	Function run by the workers to summarize one article of the dump.
+	Returns the title, the output path and the error message if it failed.
+
+	Parameters:
+		1) job - tuple of (title, wikitext, output)
+	"""
+
+	title, wikitext, output = job
+
+	try:
+		write_summary(title, output, summarizer.summarize(wikitext_to_text(wikitext)))
+
+	except Exception as e:
+		return title, None, str(e)
+
+	return title, output, None
+
+
+def summarize_pages(jobs):
+	"""
+	Function run by the workers to summarize a batch of articles, ranking the sentences
+	of the whole batch at once. If the batch fails its articles are summarized one by one.
+	Returns the title, the output path and the error message of every article.
+
+	Parameters:
+		1) jobs - list of (title, wikitext, output) tuples
+	"""
+
+	try:
+		summaries = summarizer.summarize_batch([wikitext_to_text(wikitext) for _, wikitext, _ in jobs])
+
+	except Exception:
+		return [summarize_page(job) for job in jobs]
+
+	results = []
+
+	for (title, _, output), summary in zip(jobs, summaries):
+		try:
+			write_summary(title, output, summary)
+			results.append((title, output, None))
+
+		except Exception as e:
+			results.append((title, None, str(e)))
+
+	return results
+
+
+def write_summary(title, output, summary):
+	"""
+	Write the title, the url and the summary of an article to its output file.
+
+	Parameters:
+		1) title - title of the article
+		2) output - the file to write
+		3) summary - the summary of the article
+	"""
+
+	FileSink(path=output).write(Result(title, title_to_url(title.replace(" ", "_")), summary, title))
+
+
+def run_dump(path, output_dir, processes=None, keyword_limit=25, sentence_limit=0.65, limit=None, vectorized=False, batch_size=16):
+	"""
+	Summarize every article of a dump across a pool of worker processes.
+	Returns the number of articles that failed.
+
+	Parameters:
+		1) path - path of the dump, plain or .bz2
+		2) output_dir - directory that will hold one summary file per article
+		3) processes - number of worker processes, defaults to the number of cores
+		4) keyword_limit - use this many keywords when using algorithm
+		5) sentence_limit - floating percentange that limits the amount of sentences gathered
+		6) limit - stop after this many articles, None reads the whole dump
+		7) vectorized - rank sentences with NumPy
+		8) batch_size - how many articles a worker is given at once, their sentences are ranked together
+	"""
+
+	failures = 0
+	os.makedirs(output_dir, exist_ok=True)
+
+	def jobs():
+		for count, (title, wikitext) in enumerate(iter_pages(path)):
+			if limit is not None and count >= limit:
+				break
+			yield title, wikitext, output_path(output_dir, title)
+
+	def batches():
+		batch = []
+		for job in jobs():
+			batch.append(job)
+			if len(batch) == batch_size:
+				yield batch
+				batch = []
+		if batch:
+			yield batch
+
+	with Pool(processes, initializer=init_worker, initargs=(keyword_limit, sentence_limit, vectorized)) as pool:
+		for results in pool.imap_unordered(summarize_pages, batches()):
+			for title, output, error in results:
+				if error:
+					failures += 1
+					print("FAILED\t{}\t{}".format(title, error), file=sys.stderr)
+				else:
+					print("OK\t{}\t{}".format(title, output))
+
+	return failures
+
+
+def main():
+	"""Driver function to summarize a local dump."""
+	parser = argparse.ArgumentParser(description="Summarize the articles of a MediaWiki XML dump.")
+	parser.add_argument("dump", help="path of the dump, plain XML or .bz2")
+	parser.add_argument("--output-dir", default="summaries", help="directory for the summaries")
+	parser.add_argument("--processes", type=int, help="number of worker processes, defaults to the number of cores")
+	parser.add_argument("--limit", type=int, help="stop after this many articles")
+	parser.add_argument("--vectorized", action="store_true", help="rank sentences with NumPy, a batch of articles at a time")
+	parser.add_argument("--batch-size", type=int, default=16, help="articles given to a worker at once")
+	args = parser.parse_args()
+
+	failures = run_dump(args.dump, args.output_dir, args.processes, limit=args.limit, vectorized=args.vectorized, batch_size=args.batch_size)
+	exit(1 if failures else 0)
+
+if __name__ == "__main__":
+	main()
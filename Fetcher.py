@@ -0,0 +1,279 @@
+from Metrics import NULL_METRICS
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+import datetime
+import gzip
+import http.client
+import random
+import threading
+import time
+
+#Statuses worth asking for again after waiting a little
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+class Fetcher:
+	"""
+	Class that downloads pages, revalidating them against an optional HttpCache.
+	Connections are kept alive and reused per host, and failed requests are retried
+	with capped exponential backoff.
+	"""
+
+	def __init__(self, cache=None, timeout=30, retries=5, backoff=0.5, max_backoff=30, max_redirects=5):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) cache - HttpCache used to store and revalidate pages, None disables caching
+			2) timeout - seconds to wait on the server before giving up
+			3) retries - how many times a failed request is sent again before giving up
+			4) backoff - seconds waited before the first retry, doubled after every retry
+			5) max_backoff - longest wait between two retries, also caps Retry-After
+			6) max_redirects - how many redirects are followed for one url
+		"""
+
+		self.cache = cache
+		self.timeout = timeout
+		self.retries = retries
+		self.backoff = backoff
+		self.max_backoff = max_backoff
+		self.max_redirects = max_redirects
+		self.ssl_context = None
+
+		#http.client connections are not thread safe so every thread keeps its own
+		self.local = threading.local()
+
+
+	def fetch(self, url, metrics=None):
+		"""
+		Function that returns the body of a url. When a cached copy exists a conditional
+		request is sent and the cached body is reused if the server answers 304.
+
+		Parameters:
+			1) url - the url to download
+			2) metrics - Metrics that count the bytes downloaded and the cache hits, or None
+		"""
+
+		metrics = metrics or NULL_METRICS
+		headers = {}
+		cached = self.cache.get(url) if self.cache else None
+
+		if cached:
+			if cached["etag"]:
+				headers["If-None-Match"] = cached["etag"]
+			if cached["last_modified"]:
+				headers["If-Modified-Since"] = cached["last_modified"]
+
+		status, response_headers, body = self.request(url, headers)
+		metrics.count("bytes_fetched", len(body))
+
+		if status == 304 and cached:
+			metrics.count("http_cache_hits")
+			return cached["body"]
+
+		if self.cache:
+			metrics.count("http_cache_misses")
+			self.cache.put(url, body, response_headers.get("ETag"), response_headers.get("Last-Modified"))
+
+		return body
+
+
+	def request(self, url, headers):
+		"""
+		Function that sends a GET request, following redirects and retrying failures.
+		Returns the status, the headers and the body of the final response.
+
+		Parameters:
+			1) url - the url to request
+			2) headers - extra request headers
+		"""
+
+		for redirect in range(self.max_redirects + 1):
+			status, response_headers, body = self.request_with_retries(url, headers)
+
+			if status not in REDIRECT_STATUSES:
+				break
+
+			url = urljoin(url, response_headers.get("Location", ""))
+		else:
+			raise HTTPError(url, status, "Too many redirects", response_headers, None)
+
+		if status >= 400:
+			raise HTTPError(url, status, http.client.responses.get(status, ""), response_headers, None)
+
+		return status, response_headers, body
+
+
+	def request_with_retries(self, url, headers):
+		"""
+		Function that sends a single GET request, retrying on connection errors and
+		on statuses in RETRY_STATUSES.
+
+		Parameters:
+			1) url - the url to request
+			2) headers - extra request headers
+		"""
+
+		attempt = 0
+
+		while True:
+			retry_after = None
+
+			try:
+				status, response_headers, body = self.send(url, headers)
+				if status not in RETRY_STATUSES:
+					return status, response_headers, body
+				retry_after = self.parse_retry_after(response_headers.get("Retry-After"))
+				error = HTTPError(url, status, http.client.responses.get(status, ""), response_headers, None)
+
+			except (OSError, http.client.HTTPException) as e:
+				self.drop_connection(url)
+				error = e
+
+			if attempt >= self.retries:
+				raise error
+
+			self.wait(attempt, retry_after)
+			attempt += 1
+
+
+	def wait(self, attempt, retry_after=None):
+		"""
+		Sleep before the next retry. The delay doubles with every attempt up to max_backoff
+		and is randomized so many workers do not retry in lockstep. A Retry-After from the
+		server is honored when it asks for a longer wait.
+
+		Parameters:
+			1) attempt - how many retries have already been made
+			2) retry_after - seconds the server asked to wait, or None
+		"""
+
+		delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+		if retry_after is not None:
+			delay = max(delay, min(self.max_backoff, retry_after))
+
+		time.sleep(delay)
+
+
+	@staticmethod
+	def parse_retry_after(value):
+		"""
+		Function that converts a Retry-After header to seconds, or None if it is missing or invalid.
+
+		Parameters:
+			1) value - the header, either a number of seconds or an HTTP date
+		"""
+
+		if not value:
+			return None
+
+		try:
+			return max(0.0, float(value))
+		except ValueError:
+			pass
+
+		from email.utils import parsedate_to_datetime
+
+		try:
+			when = parsedate_to_datetime(value)
+		except (TypeError, ValueError):
+			return None
+
+		if when.tzinfo is None:
+			when = when.replace(tzinfo=datetime.timezone.utc)
+
+		return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+	def send(self, url, headers):
+		"""
+		Function that sends one GET request over a kept alive connection and reads the whole response.
+
+		Parameters:
+			1) url - the url to request
+			2) headers - extra request headers
+		"""
+
+		parts = urlsplit(url)
+		path = parts.path or "/"
+		if parts.query:
+			path += "?" + parts.query
+
+		request_headers = {"Accept-Encoding": "gzip", "Connection": "keep-alive", "User-Agent": "Summarizer"}
+		request_headers.update(headers)
+
+		connection = self.connection(url)
+		connection.request("GET", path, headers=request_headers)
+		response = connection.getresponse()
+		body = response.read()
+
+		if response.getheader("Content-Encoding", "").lower() == "gzip":
+			body = gzip.decompress(body)
+
+		if response.will_close:
+			self.drop_connection(url)
+
+		return response.status, response.headers, body
+
+
+	def connection(self, url):
+		"""
+		Function that returns this thread's open connection to the host of a url, opening one if needed.
+
+		Parameters:
+			1) url - the url that will be requested
+		"""
+
+		connections = self.connections()
+		parts = urlsplit(url)
+		key = (parts.scheme, parts.hostname, parts.port)
+
+		if key not in connections:
+			if parts.scheme == "https":
+				#Building the context loads the system certificates, only pay for it when https is used
+				if self.ssl_context is None:
+					import ssl
+					self.ssl_context = ssl.create_default_context()
+				connections[key] = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=self.timeout, context=self.ssl_context)
+			elif parts.scheme == "http":
+				connections[key] = http.client.HTTPConnection(parts.hostname, parts.port, timeout=self.timeout)
+			else:
+				raise ValueError("Unsupported url: {}".format(url))
+
+		return connections[key]
+
+
+	def connections(self):
+		"""Function that returns the connections opened by the current thread."""
+
+		if not hasattr(self.local, "connections"):
+			self.local.connections = {}
+
+		return self.local.connections
+
+
+	def drop_connection(self, url):
+		"""
+		Close this thread's connection to the host of a url so the next request opens a new one.
+
+		Parameters:
+			1) url - the url whose connection should be closed
+		"""
+
+		parts = urlsplit(url)
+		connection = self.connections().pop((parts.scheme, parts.hostname, parts.port), None)
+
+		if connection:
+			connection.close()
+
+
+	def close(self):
+		"""Close every connection opened by the current thread."""
+
+		connections = self.connections()
+
+		for connection in connections.values():
+			connection.close()
+
+		connections.clear()
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+def replace_file(path, data, mode=None):
+	"""
+	Write a file under a temporary name in the same directory and rename it into place,
+	so readers never see half of it. The temporary file is removed if anything fails.
+
+	Parameters:
+		1) path - the file to write
+		2) data - the bytes to write, or a string written as UTF-8
+		3) mode - permissions the file is given, None keeps mkstemp's owner only ones
+	"""
+
+	if isinstance(data, str):
+		data = data.encode("utf-8")
+
+	fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+
+	try:
+		with os.fdopen(fd, "wb") as f:
+			f.write(data)
+
+		if mode is not None:
+			os.chmod(tmp_path, mode)
+
+		os.replace(tmp_path, path)
+	except BaseException:
+		os.unlink(tmp_path)
+		raise
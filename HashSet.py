@@ -0,0 +1,106 @@
+from array import array
+import hashlib
+
+def key_hash(key):
+	"""
+	Function that returns a 64 bit hash of a string, never 0. Two strings sharing a hash
+	is unlikely enough to be ignored.
+
+	Parameters:
+		1) key - the string to hash
+	"""
+
+	return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") or 1
+
+
+class HashSet:
+	"""
+	Class that holds 64 bit hashes in one open-addressed array('Q'), 8 bytes a slot and
+	between a third and two thirds of the slots in use, instead of a Python int and a set
+	entry for every hash. Slots holding 0 are empty.
+
+	It is not thread safe, callers sharing one hold their own lock.
+	"""
+
+	def __init__(self, capacity=1024):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) capacity - number of slots to start with, rounded up to a power of two
+		"""
+
+		slots = 1
+		while slots < capacity:
+			slots *= 2
+
+		self.table = array("Q", bytes(8 * slots))
+		self.size = 0
+
+
+	def slot(self, value):
+		"""
+		Function that returns the slot holding a hash, or the empty slot it would go in.
+
+		Parameters:
+			1) value - the hash to look for
+		"""
+
+		table = self.table
+		mask = len(table) - 1
+		index = value & mask
+
+		#The hashes are already uniform, so the low bits pick the slot and neighbours are probed in turn
+		while table[index] != 0 and table[index] != value:
+			index = (index + 1) & mask
+
+		return index
+
+
+	def add(self, value):
+		"""
+		Function that adds a hash, returning True if it was not in the set before.
+
+		Parameters:
+			1) value - the hash to add, see key_hash
+		"""
+
+		index = self.slot(value)
+		if self.table[index] == value:
+			return False
+
+		self.table[index] = value
+		self.size += 1
+
+		if 3 * self.size > 2 * len(self.table):
+			self.grow()
+
+		return True
+
+
+	def grow(self):
+		"""Function that doubles the number of slots and puts every hash back."""
+
+		old = self.table
+		self.table = array("Q", bytes(16 * len(old)))
+
+		for value in old:
+			if value != 0:
+				self.table[self.slot(value)] = value
+
+
+	def __contains__(self, value):
+		"""
+		Function that returns whether a hash is in the set.
+
+		Parameters:
+			1) value - the hash to look for
+		"""
+
+		return self.table[self.slot(value)] == value
+
+
+	def __len__(self):
+		"""Function that returns how many hashes are in the set."""
+
+		return self.size
@@ -0,0 +1,225 @@
+from Files import replace_file
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+import time
+
+class HttpCache:
+	"""
+	Class that keeps downloaded pages on disk together with their ETag and
+	Last-Modified headers so they can be revalidated instead of downloaded again.
+	Entries are evicted least recently used first once the cache grows past its size cap.
+	The index is kept in memory and written to disk by flush, which put also calls once
+	flush_interval seconds have passed, so storing a page never waits on writing the index.
+
+	Only one process should use a directory at a time, since bodies the index does not
+	know of are deleted when it is loaded.
+	"""
+
+	def __init__(self, directory, max_bytes=512 * 1024 * 1024, flush_interval=30):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) directory - directory that holds the cached bodies and the index
+			2) max_bytes - total size of the cached bodies before old entries are evicted
+			3) flush_interval - most seconds new entries wait before the index is written
+		"""
+
+		self.directory = directory
+		self.max_bytes = max_bytes
+		self.flush_interval = flush_interval
+		self.index_path = os.path.join(directory, "index.json")
+		self.lock = threading.Lock()
+		self.entries = OrderedDict()
+		self.total_bytes = 0
+		self.dirty = False
+		self.written = time.monotonic()
+
+		#Held while the index is written, so two writers never race on the file
+		self.write_lock = threading.Lock()
+
+		os.makedirs(directory, exist_ok=True)
+		self.load_index()
+
+
+	@staticmethod
+	def key(url):
+		"""
+		Function that returns the file name used to store a url.
+
+		Parameters:
+			1) url - the url to store
+		"""
+
+		return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+	def body_path(self, key):
+		"""
+		Function that returns the path of the body stored under a key.
+
+		Parameters:
+			1) key - key returned by HttpCache.key
+		"""
+
+		return os.path.join(self.directory, key + ".body")
+
+
+	def load_index(self):
+		"""
+		Read the index of cached entries, oldest used first, and drop entries whose body is missing.
+		Bodies stored after the index was last written and temporary files left by a crash are deleted,
+		so they do not take up space the size cap does not count.
+		"""
+
+		try:
+			with open(self.index_path, "r", encoding="utf-8") as f:
+				entries = json.load(f)
+		except (OSError, ValueError):
+			entries = []
+
+		for entry in entries:
+			key = self.key(entry["url"])
+			if os.path.exists(self.body_path(key)):
+				self.entries[key] = entry
+				self.total_bytes += entry["size"]
+
+		for name in os.listdir(self.directory):
+			key, extension = os.path.splitext(name)
+			if extension == ".tmp" or (extension == ".body" and key not in self.entries):
+				try:
+					os.unlink(os.path.join(self.directory, name))
+				except OSError:
+					pass
+
+
+	def get(self, url):
+		"""
+		Function that returns the cached entry for a url, or None when it is not cached.
+		The entry is a dict holding the body and its 'etag' and 'last_modified' validators.
+
+		Parameters:
+			1) url - the url to look up
+		"""
+
+		key = self.key(url)
+
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is None:
+				return None
+			self.entries.move_to_end(key)
+			self.dirty = True
+
+		try:
+			with open(self.body_path(key), "rb") as f:
+				body = f.read()
+		except OSError:
+			self.remove(key)
+			return None
+
+		return dict(entry, body=body)
+
+
+	def put(self, url, body, etag=None, last_modified=None):
+		"""
+		Function that stores a downloaded body. Bodies without a validator are not stored
+		since they could never be revalidated.
+
+		Parameters:
+			1) url - the url the body was downloaded from
+			2) body - the downloaded bytes
+			3) etag - the ETag header of the response
+			4) last_modified - the Last-Modified header of the response
+		"""
+
+		if not etag and not last_modified:
+			return
+
+		if len(body) > self.max_bytes:
+			return
+
+		key = self.key(url)
+
+		#Write to a temporary file first so readers never see a partial body
+		replace_file(self.body_path(key), body)
+
+		with self.lock:
+			old = self.entries.pop(key, None)
+			if old:
+				self.total_bytes -= old["size"]
+
+			self.entries[key] = {"url": url, "etag": etag, "last_modified": last_modified, "size": len(body)}
+			self.total_bytes += len(body)
+			self.evict()
+			self.dirty = True
+			due = time.monotonic() - self.written >= self.flush_interval
+
+		if due:
+			self.flush()
+
+
+	def remove(self, key):
+		"""
+		Function that drops an entry from the cache.
+
+		Parameters:
+			1) key - key returned by HttpCache.key
+		"""
+
+		with self.lock:
+			entry = self.entries.pop(key, None)
+			if entry:
+				self.total_bytes -= entry["size"]
+				self.dirty = True
+
+		try:
+			os.remove(self.body_path(key))
+		except OSError:
+			pass
+
+
+	def evict(self):
+		"""Remove the least recently used entries until the cache fits its size cap. Called with the lock held."""
+
+		while self.total_bytes > self.max_bytes and self.entries:
+			key, entry = self.entries.popitem(last=False)
+			self.total_bytes -= entry["size"]
+			try:
+				os.remove(self.body_path(key))
+			except OSError:
+				pass
+
+
+	def write_index(self, entries):
+		"""
+		Write the index to disk.
+
+		Parameters:
+			1) entries - the entries, least recently used first
+		"""
+
+		replace_file(self.index_path, json.dumps(entries))
+
+
+	def flush(self):
+		"""Persist the entries and their recency order if they changed since the last write."""
+
+		with self.write_lock:
+			#Only the snapshot is taken under the lock, fetch threads do not wait on the disk
+			with self.lock:
+				if not self.dirty:
+					return
+				entries = list(self.entries.values())
+				self.dirty = False
+				self.written = time.monotonic()
+
+			try:
+				self.write_index(entries)
+			except BaseException:
+				with self.lock:
+					self.dirty = True
+				raise
@@ -0,0 +1,174 @@
+from collections import Counter
+from Segmenter import Sentences
+
+class Paragraph:
+	"""Class that holds the intermediate results of one paragraph of an article."""
+
+	def __init__(self, sentences, sentence_counts):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) sentences - the sentences split out of the paragraph
+			2) sentence_counts - for every sentence, dict of the Vocabulary ids of the words that can be keywords to their occurences
+		"""
+
+		self.sentences = sentences
+		self.sentence_counts = sentence_counts
+		self.counts = Counter()
+
+		for counts in sentence_counts:
+			self.counts.update(counts)
+
+
+class IncrementalSummarizer:
+	"""
+	Class that summarizes successive revisions of one article, reprocessing only the
+	paragraphs that changed since the last revision.
+
+	The split sentences and keyword counts of every paragraph are kept between runs.
+	The counts of the whole article are updated by subtracting the removed paragraphs
+	and adding the new ones, and only the ranking is redone over the whole article.
+	The summary is the same as Summarizer.grab_summary would give for the revision,
+	with any scoring and ranking the Summarizer is set up with.
+
+	The kept paragraphs share one Vocabulary, which also keeps the words of paragraphs
+	that are gone. Once it has grown past max_words and to twice the words it had after
+	the last fresh start, it is dropped with everything kept and the next revision is
+	processed from scratch.
+	"""
+
+	def __init__(self, summarizer, max_words=1 << 16, name=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) summarizer - the Summarizer whose settings and stages are used
+			2) max_words - most words the vocabulary holds before it can be dropped
+			3) name - what identifies the article in the document frequency index so its revisions are counted once, None identifies every revision by its words
+		"""
+
+		self.summarizer = summarizer
+		self.max_words = max_words
+		self.name = name
+		self.fresh_words = 0
+		self.reprocessed = 0
+		self.clear()
+
+
+	def clear(self):
+		"""Function that forgets every paragraph and word, so the next revision is processed from scratch."""
+
+		self.vocabulary = self.summarizer.new_vocabulary()
+		self.paragraphs = {}
+		self.occurences = Counter()
+		self.counts = Counter()
+
+
+	def summarize(self, text):
+		"""
+		Function that cleans the text of a new revision and returns its summary.
+
+		Parameters:
+			1) text - the visible text of the page
+		"""
+
+		return self.grab_summary(self.summarizer.clean(text))
+
+
+	def grab_summary(self, text):
+		"""
+		Function that returns the summary of a new revision of the cleaned text.
+
+		Parameters:
+			1) text - the cleaned text of the revision
+		"""
+
+		summarizer = self.summarizer
+		fresh = len(self.vocabulary) > max(self.max_words, 2 * self.fresh_words)
+
+		if fresh:
+			self.clear()
+
+		#Paragraphs are marked the same way grab_summary marks them so the results match
+		lines = summarizer.mark_end_of_paragraphs(text).splitlines()
+		occurences = Counter(lines)
+
+		#Only the paragraphs that were not in the last revision are split and counted
+		self.reprocessed = 0
+		for line in occurences:
+			if line not in self.paragraphs:
+				self.paragraphs[line] = self.process(line)
+				self.reprocessed += 1
+
+		for line, count in (occurences - self.occurences).items():
+			for word, n in self.paragraphs[line].counts.items():
+				self.counts[word] += n * count
+
+		for line, count in (self.occurences - occurences).items():
+			for word, n in self.paragraphs[line].counts.items():
+				self.counts[word] -= n * count
+				if self.counts[word] <= 0:
+					del self.counts[word]
+
+		#Forget the paragraphs that are gone from the article
+		for line in list(self.paragraphs):
+			if line not in occurences:
+				del self.paragraphs[line]
+
+		self.occurences = occurences
+
+		if fresh:
+			self.fresh_words = len(self.vocabulary)
+
+		return self.rank(lines)
+
+
+	def process(self, line):
+		"""
+		Function that splits one paragraph and counts its words.
+
+		Parameters:
+			1) line - the marked paragraph
+		"""
+
+		summarizer = self.summarizer
+		sentences = summarizer.split_text(line, self.vocabulary)
+
+		return Paragraph(sentences, [summarizer.count_tokens(tokens, self.vocabulary) for tokens in sentences.token_arrays()])
+
+
+	def rank(self, lines):
+		"""
+		Function that picks the keywords and the best sentences of the whole article.
+
+		Parameters:
+			1) lines - the marked paragraphs of the article in order
+		"""
+
+		summarizer = self.summarizer
+		paragraphs = [self.paragraphs[line] for line in lines]
+
+		#Walk the words in the order they are first seen so ties break like grab_keywords
+		seen = {}
+		for paragraph in paragraphs:
+			seen.update(paragraph.counts)
+
+		keywords = summarizer.pick_keywords({word: self.counts[word] for word in seen}, self.vocabulary, self.name)
+
+		#The kept sentences carry their tokens, so the article is not tokenized again
+		sentences = Sentences(vocabulary=self.vocabulary)
+		for paragraph in paragraphs:
+			sentences.add_all(paragraph.sentences)
+
+		#Raw keyword counts come straight from the kept counts, other scorings rank like Summarizer
+		if summarizer.scoring == "count":
+			keywords = set(summarizer.keyword_weights(keywords, self.vocabulary))
+			ranks = [sum(n for word, n in counts.items() if word in keywords) for paragraph in paragraphs for counts in paragraph.sentence_counts]
+		else:
+			ranks = summarizer.keyword_ranks(sentences, keywords)
+
+		ranks = summarizer.graph_ranks(sentences, ranks)
+		summary = [str(sentences[index]) for index in summarizer.select_sentences(ranks)]
+
+		return summarizer.group_summary(summary)
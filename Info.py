@@ -1,15 +1,20 @@
 from Summarizer import *
-from urllib.request import urlopen
-from bs4 import BeautifulSoup
-import re
+from Metrics import NULL_METRICS, Metrics, MetricsRegistry
+from Sinks import FileSink, JsonLinesSink, Result, StdoutSink
+from TextExtractor import EXTRACTORS, parse_page
+import argparse
 import sys
 
+#Options a title handed to a daemon cannot be summarized with
+DAEMON_CONFLICTS = ("batch", "extractor", "cache_dir", "cache_size", "result_cache_dir", "scoring", "df_index", "vectorized", "ranking",
+	"textrank_sentences", "textrank_iterations", "metrics", "prometheus")
+
 class Info:
 	"""Class that handles the information for the article and is also responsible
 	for obtaining the summary for the article.
 	"""
 
-	def __init__(self, url, keyword_limit, sentence_limit):
+	def __init__(self, url, keyword_limit, sentence_limit, output="summary.txt", fetcher=None, extractor="soup", summarizer=None, metrics=None, sink=None, name=None):
 		"""
 		Initialization function for this class.
 
@@ -17,11 +22,24 @@ class Info:
 			1) url - url to visit to gather information
 			2) keyword_limit - use this many keywords when using algorithm
 			3) sentence_limit - floating percentange that limits the amount of sentences gathered
+			4) output - path of the text file the info and summary are written to when no sink is given
+			5) fetcher - Fetcher used to download the article, shared between articles to share its cache
+			6) extractor - backend used to parse the page, see TextExtractor.EXTRACTORS
+			7) summarizer - Summarizer shared between articles, when given the limits above are not used
+			8) metrics - Metrics recording the time spent in every stage of this article, or None
+			9) sink - where the result is written, see Sinks, defaults to a FileSink writing output
+			10) name - name the result is filed under, such as the title that was asked for
 		"""
 
 		self.url = url
-		self.summary = Summarizer(url, keyword_limit, sentence_limit)
-		self.soup = self.open_url()
+		self.metrics = metrics or NULL_METRICS
+		self.output = output
+		self.sink = sink or FileSink(path=output)
+		self.name = name
+		self.extractor = extractor
+		self.fetcher = fetcher or new_fetcher()
+		self.summary = summarizer or Summarizer(url, keyword_limit, sentence_limit, self.fetcher, extractor)
+		self.page = self.open_url()
 		self.title = None
 		self.author = None
 		self.description = None
@@ -29,84 +47,302 @@ class Info:
 
 
 	def run(self):
-		"""Driver function for this class."""
+		"""Driver function for this class. Returns the Result that was written to the sink."""
+
+		requested = self.url
 
 		#Gather relevant info
 		self.gather_info()
 
-		#Print relevant info to text file
-		self.print_info()
-
-		self.summary.fill_ignored()
+		#Clean and summarize the already parsed contents in one stream, the document frequency
+		#index knows the article by its canonical url so a redirect to it is not counted again
+		summary = self.summary.summarize(self.page.text, self.metrics, self.url or requested)
 
-		#Grab text from contents and pass to Summarizer module
-		text = self.summary.clean_text()
+		result = Result(self.title, self.url, summary, self.name)
 
-		#Obtain summary
-		summary = self.summary.grab_summary(text)
+		#Hand the info and the summary to the sink in one piece
+		with self.metrics.stage("output"):
+			self.output = self.sink.write(result)
 
-		#Print summary to text file
-		self.summary.print_summary(summary)
+		return result
 
 
 	def open_url(self):
-		"""Open the url and return the contents."""
-		try:
-			response = urlopen(self.url)
-			html = response.read()
-			soup = BeautifulSoup(html, "html.parser")
+		"""
+		Open the url and return the contents. Busy servers are retried by the fetcher,
+		any other error is raised to the caller.
+		"""
 
-		except OSError as e:
-			if e.code == 503:
-				print("Querying site again!")
-				return self.open_url()
+		with self.metrics.stage("fetch"):
+			html = self.fetcher.fetch(self.url, self.metrics)
 
-		return soup
+		with self.metrics.stage("parse"):
+			return parse_page(html, self.extractor)
 
 
 	def gather_info(self):
 		"""
-		Parse the contents of the soup in order to obtain the title and url
+		Parse the contents of the page in order to obtain the title and url
 		for the article.
 		"""
 
-		self.title = self.soup.find("title")
+		self.title, self.url = article_info(self.page)
+
+
+def article_info(page):
+	"""
+	Function that returns the title and the wikipedia url of a parsed article.
+
+	Parameters:
+		1) page - the TextExtractor.Page of the article
+	"""
+
+	title = page.title
+	article_url = None
+
+	if title:
+		title_space = title.find(" ")
+		title = title[0:title_space]
+
+	if title:
+		for url in page.links:
+			if url.find(title) != -1 and url.find("https://en.wikipedia.org") != -1:
+				article_url = url
+				break
+
+	return title, article_url
+
+
+def new_fetcher(cache=None):
+	"""
+	Function that builds a Fetcher, the network modules are only imported once one is needed.
+
+	Parameters:
+		1) cache - HttpCache used to store and revalidate pages, or None
+	"""
+
+	from Fetcher import Fetcher
+
+	return Fetcher(cache)
+
+
+def title_to_url(title):
+	"""
+	Build the wikipedia url for an article title.
+
+	Parameters:
+		1) title - the title to query
+	"""
+
+	return "https://en.wikipedia.org/wiki/" + title[0].upper() + title[1:]
+
+
+def summarize_title(title, sink, fetcher=None, extractor="soup", summarizer=None, registry=None):
+	"""
+	Fetch and summarize a single title, writing the result to a sink.
+	Returns what the sink returned, such as the path of the file written.
+
+	Parameters:
+		1) title - the title to query
+		2) sink - where the result is written, see Sinks
+		3) fetcher - Fetcher used to download the article
+		4) extractor - backend used to parse the page
+		5) summarizer - Summarizer to use instead of building one for this title
+		6) registry - MetricsRegistry the metrics of this title are added to, None turns instrumentation off
+	"""
+
+	metrics = Metrics() if registry else NULL_METRICS
 
-		if self.title:
-			title_space = self.title.contents[0].find(" ")
-			self.title = self.title.contents[0][0:title_space]
+	try:
+		with metrics.stage("total"):
+			info = Info(title_to_url(title), 25, 0.65, None, fetcher, extractor, summarizer, metrics, sink, title)
+			info.run()
+	except Exception:
+		if registry:
+			registry.add(metrics, ok=False, title=title)
+		raise
 
-		self.url = self.soup.findAll("link")
+	if registry:
+		registry.add(metrics, title=title)
 
-		if self.url:
-			for url in self.url:
-				url = url['href']
-				if url.find(self.title) != -1 and url.find("https://en.wikipedia.org") != -1:
-					self.url = url
-					break
+	return info.output
 
 
-	def print_info(self):
-		"""Print out the relevant info where applicable."""
+def read_titles(source):
+	"""
+	Read the unique titles, one per line, from a file or from stdin when source is '-'.
+
+	Parameters:
+		1) source - path of the title list or '-'
+	"""
+
+	if source == "-":
+		lines = sys.stdin.read().splitlines()
+	else:
+		with open(source, "r", encoding="utf-8") as f:
+			lines = f.read().splitlines()
+
+	#Drop blank lines and duplicate titles so no two workers write the same result
+	return list(dict.fromkeys(line.strip() for line in lines if line.strip()))
 
-		#Write all the information to a text file that can handle utf-8 to avoid encoding errors.
-		with open("summary.txt", "wb") as f:
-			f.write(("Title: {}\n".format(self.title)).encode('utf-8'))
-			f.write(("Url: {}\n".format(self.url)).encode('utf-8'))
+
+def run_batch(titles, workers, sink, fetcher=None, extractor="soup", summarizer=None, registry=None):
+	"""
+	Summarize many titles concurrently with a bounded thread pool.
+	Returns the number of titles that failed.
+
+	Parameters:
+		1) titles - the titles to query
+		2) workers - maximum number of articles processed at the same time
+		3) sink - where every result is written, shared by all the workers
+		4) fetcher - Fetcher shared by all the workers
+		5) extractor - backend used to parse the pages
+		6) summarizer - Summarizer shared by all the workers
+		7) registry - MetricsRegistry adding up the metrics of every title, or None
+	"""
+
+	failures = 0
+
+	from concurrent.futures import ThreadPoolExecutor, as_completed
+
+	#One engine and one fetcher serve every title, neither keeps state between articles
+	summarizer = summarizer or Summarizer(None, 25, 0.65)
+	fetcher = fetcher or new_fetcher()
+
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		futures = {}
+		for title in titles:
+			future = executor.submit(summarize_title, title, sink, fetcher, extractor, summarizer, registry)
+			futures[future] = title
+
+		for future in as_completed(futures):
+			title = futures[future]
+			try:
+				output = future.result()
+				print("OK\t{}\t{}".format(title, output))
+			except Exception as e:
+				failures += 1
+				print("FAILED\t{}\t{}".format(title, e), file=sys.stderr)
+
+	return failures
+
+
+def run_with_daemon(path, title, sink):
+	"""
+	Have a running daemon summarize a title and write its result to the sink. Returns the
+	exit status, or None when no daemon listens and the title is to be summarized here.
+	A daemon that is there but fails to answer is a failure, not a reason to start over.
+
+	Parameters:
+		1) path - path of the daemon's Unix socket
+		2) title - the title to summarize
+		3) sink - where the result is written
+	"""
+
+	from Daemon import request
+
+	try:
+		response = request(path, title)
+	except (ConnectionRefusedError, FileNotFoundError) as e:
+		print("No daemon on {} ({}), summarizing here".format(path, e), file=sys.stderr)
+		return None
+	except OSError as e:
+		response = {"error": "The daemon on {} did not answer: {}".format(path, e)}
+
+	try:
+		if response["error"]:
+			print("FAILED\t{}\t{}".format(title, response["error"]), file=sys.stderr)
+			return 1
+		else:
+			sink.write(Result(response["title"], response["url"], response["summary"], title))
+	finally:
+		sink.close()
+
+	return 0
 
 
 def main():
 	"""Driver function to run the program."""
-	if len(sys.argv) != 2:
+	parser = argparse.ArgumentParser(description="Summarize wikipedia articles.")
+	parser.add_argument("title", nargs="?", help="title of the article to summarize")
+	parser.add_argument("--batch", metavar="FILE", help="file with one title per line, '-' reads stdin")
+	parser.add_argument("--workers", type=int, default=8, help="articles processed at the same time in batch mode")
+	parser.add_argument("--sink", choices=("files", "jsonl", "stdout"), default="files", help="write a file per article, one JSON line per article or print the summaries")
+	parser.add_argument("--output-dir", default="summaries", help="directory for the batch mode summary files")
+	parser.add_argument("--jsonl", default="summaries.jsonl", help="file the jsonl sink appends to")
+	parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="soup", help="backend used to turn pages into text")
+	parser.add_argument("--cache-dir", help="keep downloaded pages in this directory and revalidate them on later runs")
+	parser.add_argument("--cache-size", type=int, default=512, help="size cap of the page cache in megabytes")
+	parser.add_argument("--result-cache-dir", help="keep finished summaries in this directory so unchanged text is not summarized again")
+	parser.add_argument("--scoring", choices=SCORINGS, default="count", help="rank keywords by raw counts or by TF-IDF")
+	parser.add_argument("--df-index", metavar="FILE", help="document frequency index used and grown by the tfidf scoring")
+	parser.add_argument("--vectorized", action="store_true", help="rank sentences with NumPy")
+	parser.add_argument("--ranking", choices=RANKINGS, default="keywords", help="pick the sentences with the most keywords or the most central ones by TextRank")
+	parser.add_argument("--textrank-sentences", type=int, default=400, help="most sentences the TextRank graph holds")
+	parser.add_argument("--textrank-iterations", type=int, default=50, help="most TextRank power iteration steps")
+	parser.add_argument("--metrics", metavar="FILE", help="append the timings and counters of every article to this file as JSON lines")
+	parser.add_argument("--prometheus", metavar="FILE", help="write the totals of the timings and counters to this Prometheus text file")
+	parser.add_argument("--daemon", metavar="SOCKET", help="hand a single title to the Daemon.py listening on this socket, summarizing locally if none is")
+	args = parser.parse_args()
+
+	if not args.batch and not args.title:
 		print("Please provide a word to query!")
 		exit(1)
 
-	test = "tseting"
+	if args.scoring == "tfidf" and not args.df_index:
+		print("Please provide a --df-index for the tfidf scoring!")
+		exit(1)
+
+	if args.sink == "jsonl":
+		sink = JsonLinesSink(args.jsonl)
+	elif args.sink == "stdout":
+		sink = StdoutSink()
+	elif args.batch:
+		sink = FileSink(args.output_dir)
+	else:
+		sink = FileSink(path="summary.txt")
+
+	#The daemon summarizes with the settings it was started with, none can be asked for here
+	if args.daemon:
+		for option in DAEMON_CONFLICTS:
+			if getattr(args, option) != parser.get_default(option):
+				print("--{} cannot be used with --daemon, start Daemon.py with the settings it needs instead!".format(option.replace("_", "-")))
+				exit(1)
+
+		#The daemon already has everything loaded, so nothing else needs to be
+		status = run_with_daemon(args.daemon, args.title, sink)
+		if status is not None:
+			exit(status)
+
+	from DocumentFrequency import DocumentFrequency
+	from HttpCache import HttpCache
+	from ResultCache import ResultCache
+
+	cache = HttpCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None
+	fetcher = new_fetcher(cache)
+	df_index = DocumentFrequency(args.df_index) if args.df_index else None
+	text_rank = TextRank(args.textrank_sentences, args.textrank_iterations) if args.ranking == "textrank" else None
+	summarizer = Summarizer(None, 25, 0.65, result_cache=ResultCache(directory=args.result_cache_dir), scoring=args.scoring, df_index=df_index, vectorized=args.vectorized, ranking=args.ranking, text_rank=text_rank)
+	registry = MetricsRegistry(args.metrics) if args.metrics or args.prometheus else None
+
+	try:
+		if args.batch:
+			failures = run_batch(read_titles(args.batch), args.workers, sink, fetcher, args.extractor, summarizer, registry)
+		else:
+			summarize_title(args.title, sink, fetcher, args.extractor, summarizer, registry)
+			failures = 0
+	finally:
+		#What was downloaded and counted is kept even when the run is cut short
+		sink.close()
+		if cache:
+			cache.flush()
+		if df_index:
+			df_index.close()
+
+	if registry and args.prometheus:
+		registry.write_prometheus(args.prometheus)
 
-	url = sys.argv[1]
-	url = "https://en.wikipedia.org/wiki/" + url[0].upper() + url[1:]
-	info = Info(url, 25, 0.65)
-	info.run()
+	exit(1 if failures else 0)
 
 if __name__ == "__main__":
 	main()
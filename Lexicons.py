@@ -0,0 +1,132 @@
+import re
+import threading
+
+IGNORED_WORDS_PATH = "ignored_words/ignored_words.txt"
+REPLACED_WORDS_PATH = "replaced_words/replaced_words.txt"
+
+#Lexicons already read by this process, keyed by (kind, path)
+loaded = {}
+lock = threading.Lock()
+
+class Replacer:
+	"""
+	Class that replaces every word of a lexicon in a single scan of the text using one
+	combined pattern, instead of one pass over the text per word.
+	"""
+
+	def __init__(self, replacements):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) replacements - dict of word to the text that replaces it
+		"""
+
+		self.replacements = replacements
+		self.pattern = None
+
+		if replacements:
+			#Longest words first so 'Mrs.' wins over 'Mr' when both could match
+			words = sorted(replacements, key=len, reverse=True)
+			self.pattern = re.compile("|".join(re.escape(word) for word in words))
+
+
+	def replace(self, text):
+		"""
+		Function that returns the text with every word of the lexicon replaced.
+
+		Parameters:
+			1) text - the text to replace words in
+		"""
+
+		if self.pattern is None:
+			return text
+
+		return self.pattern.sub(lambda match: self.replacements[match.group(0)], text)
+
+
+def read_ignored_words(path):
+	"""
+	Function that reads the words to ignore such as 'The', 'a', etc. Every word is also
+	added with a lowercase first letter.
+
+	Parameters:
+		1) path - file with one word per line
+	"""
+
+	ignored_words = set()
+
+	with open(path, "r") as f:
+		for ignored_word in f:
+			ignored_word = ignored_word.strip()
+			if ignored_word:
+				ignored_words.add(ignored_word)
+				ignored_words.add(ignored_word[0].lower() + ignored_word[1:])
+
+	return frozenset(ignored_words)
+
+
+def read_replacements(path):
+	"""
+	Function that reads the words to replace, one 'word=replacement' per line.
+
+	Parameters:
+		1) path - file holding the replacements
+	"""
+
+	replacements = {}
+
+	with open(path, "r") as f:
+		for line in f:
+			line = line.rstrip("\r\n")
+			delimiter = line.find("=")
+			if delimiter > 0:
+				replacements.setdefault(line[0:delimiter], line[delimiter+1:])
+
+	return Replacer(replacements)
+
+
+def load(kind, path, reader):
+	"""
+	Function that reads a lexicon the first time it is asked for and returns the same
+	read-only object on every later call, from any thread.
+
+	Parameters:
+		1) kind - name of the lexicon
+		2) path - file holding the lexicon
+		3) reader - function that reads the file
+	"""
+
+	key = (kind, path)
+	lexicon = loaded.get(key)
+
+	if lexicon is None:
+		with lock:
+			lexicon = loaded.get(key)
+			if lexicon is None:
+				lexicon = reader(path)
+				loaded[key] = lexicon
+
+	return lexicon
+
+
+def load_ignored_words(path=IGNORED_WORDS_PATH):
+	"""
+	Function that returns the shared frozenset of ignored words.
+
+	Parameters:
+		1) path - file with one word per line
+	"""
+
+	return load("ignored_words", path, read_ignored_words)
+
+
+def load_replacements(path=REPLACED_WORDS_PATH):
+	"""
+	Function that returns the shared Replacer for the replaced words.
+
+	Parameters:
+		1) path - file holding the replacements
+	"""
+
+	return load("replacements", path, read_replacements)
@@ -0,0 +1,191 @@
+from Files import replace_file
+from contextlib import contextmanager
+import json
+import threading
+import time
+
+class Metrics:
+	"""
+	Class that records how long every stage of one run took and counts what it processed,
+	such as bytes fetched, characters, sentences and cache hits.
+	"""
+
+	def __init__(self):
+		"""Initialization function for this class."""
+
+		self.timings = {}
+		self.counters = {}
+
+
+	@contextmanager
+	def stage(self, name):
+		"""
+		Context manager that adds the wall time spent inside it to a stage.
+
+		Parameters:
+			1) name - name of the stage
+		"""
+
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+
+	def timed(self, name, iterable):
+		"""
+		Generator that yields the items of an iterable and adds the wall time spent making
+		them to a stage, for a stage done lazily such as a stream of cleaned lines.
+
+		Parameters:
+			1) name - name of the stage
+			2) iterable - the items to time
+		"""
+
+		iterator = iter(iterable)
+
+		while True:
+			start = time.perf_counter()
+			try:
+				item = next(iterator)
+			except StopIteration:
+				return
+			finally:
+				self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+			yield item
+
+
+	def count(self, name, amount=1):
+		"""
+		Add to a counter.
+
+		Parameters:
+			1) name - name of the counter
+			2) amount - how much to add
+		"""
+
+		self.counters[name] = self.counters.get(name, 0) + amount
+
+
+	def record(self, **labels):
+		"""
+		Function that returns the run as a dict that can be written as JSON.
+
+		Parameters:
+			1) labels - extra fields describing the run, such as the title
+		"""
+
+		return dict(labels, seconds=self.timings, counters=self.counters)
+
+
+class NullMetrics:
+	"""Class that takes the place of Metrics when instrumentation is off and records nothing."""
+
+	@contextmanager
+	def stage(self, name):
+		"""Context manager that does nothing."""
+
+		yield
+
+
+	def timed(self, name, iterable):
+		"""Function that returns the iterable as it is."""
+
+		return iterable
+
+
+	def count(self, name, amount=1):
+		"""Function that does nothing."""
+
+		pass
+
+
+#Shared by every run that is not instrumented
+NULL_METRICS = NullMetrics()
+
+
+class MetricsRegistry:
+	"""
+	Class that adds up the Metrics of many runs, for example a whole batch. Every run can
+	also be appended as one JSON line to a file, and the totals can be written in the
+	Prometheus text format for a local scrape file.
+	"""
+
+	def __init__(self, records_path=None, prefix="summarizer"):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) records_path - file every run is appended to as one JSON line, or None
+			2) prefix - prefix of the Prometheus metric names
+		"""
+
+		self.records_path = records_path
+		self.prefix = prefix
+		self.lock = threading.Lock()
+		self.runs = {}
+		self.timings = {}
+		self.counters = {}
+
+
+	def add(self, metrics, ok=True, **labels):
+		"""
+		Add the Metrics of one run to the totals.
+
+		Parameters:
+			1) metrics - the Metrics of the run
+			2) ok - whether the run succeeded
+			3) labels - extra fields written with the run's JSON line
+		"""
+
+		status = "ok" if ok else "failed"
+
+		with self.lock:
+			self.runs[status] = self.runs.get(status, 0) + 1
+
+			for name, seconds in metrics.timings.items():
+				self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+			for name, amount in metrics.counters.items():
+				self.counters[name] = self.counters.get(name, 0) + amount
+
+			if self.records_path:
+				with open(self.records_path, "a", encoding="utf-8") as f:
+					f.write(json.dumps(metrics.record(status=status, **labels)) + "\n")
+
+
+	def prometheus(self):
+		"""Function that returns the totals in the Prometheus text format."""
+
+		with self.lock:
+			lines = [
+				"# HELP {}_runs_total Articles processed.".format(self.prefix),
+				"# TYPE {}_runs_total counter".format(self.prefix),
+			]
+			for status, count in sorted(self.runs.items()):
+				lines.append('{}_runs_total{{status="{}"}} {}'.format(self.prefix, status, count))
+
+			lines.append("# HELP {}_stage_seconds_total Wall time spent in every stage.".format(self.prefix))
+			lines.append("# TYPE {}_stage_seconds_total counter".format(self.prefix))
+			for name, seconds in sorted(self.timings.items()):
+				lines.append('{}_stage_seconds_total{{stage="{}"}} {:.6f}'.format(self.prefix, name, seconds))
+
+			for name, amount in sorted(self.counters.items()):
+				lines.append("# TYPE {}_{}_total counter".format(self.prefix, name))
+				lines.append("{}_{}_total {}".format(self.prefix, name, amount))
+
+		return "\n".join(lines) + "\n"
+
+
+	def write_prometheus(self, path):
+		"""
+		Write the totals to a Prometheus text file, replacing it in one step so a scrape never reads half of it.
+
+		Parameters:
+			1) path - the file to write
+		"""
+
+		#The collector may run as another user, so the file is readable by everyone
+		replace_file(path, self.prometheus(), 0o644)
@@ -0,0 +1,137 @@
+from Files import replace_file
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+#Version of the layout of stored results, raised when it changes so older files are never read
+FORMAT = 1
+
+class ResultCache:
+	"""
+	Class that remembers finished summaries keyed by a hash of the cleaned text and the
+	summarizer parameters. Recent results are kept in memory, least recently used first
+	out, and can also be kept on disk so they survive between runs.
+	"""
+
+	def __init__(self, max_entries=1024, directory=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) max_entries - number of summaries kept in memory
+			2) directory - directory for the on-disk tier, None keeps results in memory only
+		"""
+
+		self.max_entries = max_entries
+		self.directory = directory
+		self.entries = OrderedDict()
+		self.lock = threading.Lock()
+
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+
+
+	@staticmethod
+	def key(text, parameters):
+		"""
+		Function that returns the key a summary is stored under.
+
+		Parameters:
+			1) text - the cleaned text that is summarized
+			2) parameters - string describing every setting that changes the summary
+		"""
+
+		digest = ResultCache.digest(parameters)
+		digest.update(text.encode("utf-8"))
+		return digest.hexdigest()
+
+
+	@staticmethod
+	def digest(parameters):
+		"""
+		Function that returns a hash the cleaned text can be fed to piece by piece, its
+		hexdigest is then the same key ResultCache.key returns for the whole text.
+
+		Parameters:
+			1) parameters - string describing every setting that changes the summary
+		"""
+
+		digest = hashlib.sha256("format={} {}".format(FORMAT, parameters).encode("utf-8"))
+		digest.update(b"\0")
+		return digest
+
+
+	def path(self, key):
+		"""
+		Function that returns the file a key is stored in on disk.
+
+		Parameters:
+			1) key - key returned by ResultCache.key
+		"""
+
+		return os.path.join(self.directory, key[0:2], key + ".json")
+
+
+	def get(self, key):
+		"""
+		Function that returns the summary stored under a key, or None when there is none.
+
+		Parameters:
+			1) key - key returned by ResultCache.key
+		"""
+
+		with self.lock:
+			summary = self.entries.get(key)
+			if summary is not None:
+				self.entries.move_to_end(key)
+				return list(summary)
+
+		if not self.directory:
+			return None
+
+		try:
+			with open(self.path(key), "r", encoding="utf-8") as f:
+				summary = json.load(f)
+		except (OSError, ValueError):
+			return None
+
+		self.remember(key, summary)
+		return list(summary)
+
+
+	def put(self, key, summary):
+		"""
+		Function that stores a summary under a key.
+
+		Parameters:
+			1) key - key returned by ResultCache.key
+			2) summary - the list of paragraphs to store
+		"""
+
+		self.remember(key, summary)
+
+		if self.directory:
+			path = self.path(key)
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+
+			#Write to a temporary file first so readers never see a partial result
+			replace_file(path, json.dumps(summary))
+
+
+	def remember(self, key, summary):
+		"""
+		Keep a summary in memory, dropping the least recently used one when full.
+
+		Parameters:
+			1) key - key returned by ResultCache.key
+			2) summary - the list of paragraphs to keep
+		"""
+
+		with self.lock:
+			self.entries[key] = tuple(summary)
+			self.entries.move_to_end(key)
+
+			while len(self.entries) > self.max_entries:
+				self.entries.popitem(last=False)
@@ -0,0 +1,253 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, compress, islice, repeat
+from operator import add, sub
+import re
+
+#Characters that can end a sentence
+TERMINATORS = ".!?"
+
+#Table turning every terminator into a period
+PERIODS = str.maketrans("!?", "..")
+
+#A line without its line break, split on the same breaks as str.splitlines
+LINE = re.compile("[^\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]+")
+
+class Sentences(list):
+	"""
+	Class for the sentences of a text. It is the list of their texts, so it can be used
+	anywhere a list of strings is, and also keeps where every sentence was found in the
+	cleaned text in arrays next to it, instead of an object per sentence.
+
+	When it has a Vocabulary, the ids of the words of every sentence are added to one
+	array as the sentences are, with where the words of every sentence start in it.
+	"""
+
+	__slots__ = ("starts", "ends", "vocabulary", "tokens", "bounds")
+
+	def __init__(self, texts=(), starts=(), ends=(), vocabulary=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) texts - the sentences as they are ranked and printed
+			2) starts - offset of the first character of every sentence in the cleaned text
+			3) ends - offset just past the last character of every sentence
+			4) vocabulary - Vocabulary.Vocabulary the sentences are tokenized with, or None to leave them as text
+		"""
+
+		super().__init__()
+		self.starts = array("I")
+		self.ends = array("I")
+		self.vocabulary = vocabulary
+
+		#The ids of the words of all the sentences one after the other, and where every sentence starts in them followed by the end of the last
+		self.tokens = array("I")
+		self.bounds = array("I", [0])
+
+		self.add(list(texts), starts, ends)
+
+
+	def add(self, texts, starts, ends):
+		"""
+		Add sentences, tokenizing them when there is a vocabulary.
+
+		Parameters:
+			1) texts - list of the sentences as they are ranked and printed
+			2) starts - offset of the first character of every sentence in the cleaned text
+			3) ends - offset just past the last character of every sentence
+		"""
+
+		self.extend(texts)
+		self.starts.extend(starts)
+		self.ends.extend(ends)
+
+		if self.vocabulary is not None:
+			self.vocabulary.tokenize(texts, self.tokens, self.bounds)
+
+
+	def add_all(self, sentences):
+		"""
+		Add every sentence of other sentences with their offsets. Their ids are copied when
+		they were tokenized with the same vocabulary.
+
+		Parameters:
+			1) sentences - the Sentences to add
+		"""
+
+		if self.vocabulary is None or sentences.vocabulary is not self.vocabulary:
+			self.add(sentences, sentences.starts, sentences.ends)
+			return
+
+		self.extend(sentences)
+		self.starts.extend(sentences.starts)
+		self.ends.extend(sentences.ends)
+		self.bounds.extend(map(len(self.tokens).__add__, islice(sentences.bounds, 1, None)))
+		self.tokens.extend(sentences.tokens)
+
+
+	def token_arrays(self):
+		"""Function that returns an iterator over the array of the ids of the words of every sentence, made one at a time."""
+
+		bounds = self.bounds
+		return map(self.tokens.__getitem__, map(slice, bounds, islice(bounds, 1, None)))
+
+
+	def __reduce__(self):
+		"""
+		Function that lets sentences be sent to and from worker processes. The ids of the
+		words are left behind, the sentences are tokenized again where they are needed.
+		"""
+
+		return (Sentences, (list(self), self.starts, self.ends))
+
+
+class Segmenter:
+	"""
+	Class that splits text into sentences in one scan. A '.', '!' or '?' followed by a
+	space ends a sentence, unless it belongs to a word of the abbreviation lexicon such
+	as 'Dr.'. Lines without any of the three are not sentences at all.
+
+	The words of the lexicon are replaced in the whole text at once, which takes their
+	terminators out, and then only the boundaries are searched for. Where every replaced
+	word ends is kept so the offsets of the sentences can be moved back to the text as
+	it was.
+	"""
+
+	def __init__(self, replacer, minimum=100):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) replacer - Lexicons.Replacer applied to the text, its words that hold a terminator never end a sentence
+			2) minimum - sentences this long or shorter are dropped
+		"""
+
+		self.replacer = replacer
+		self.minimum = minimum
+
+		#The lexicon pattern keeping the words it splits on
+		self.words = re.compile("(" + replacer.pattern.pattern + ")") if replacer.pattern is not None else None
+
+
+	def segment(self, text, offset=0, paragraph_end=False, sentences=None):
+		"""
+		Function that adds the sentences of a text to a Sentences and returns it.
+
+		Parameters:
+			1) text - the text to split, one or more lines
+			2) offset - offset of the text in the cleaned text
+			3) paragraph_end - whether the text ends a paragraph, its last sentence is then marked with '@'
+			4) sentences - the Sentences to add to, a new one without a Vocabulary when None
+		"""
+
+		if sentences is None:
+			sentences = Sentences()
+
+		replaced, word_ends, moves = self.replace(text)
+		minimum = self.minimum
+		texts = []
+		starts = []
+		ends = []
+
+		#With every terminator turned into a period, str.split finds all the boundaries of a line at once
+		periods = replaced.translate(PERIODS)
+
+		for line in LINE.finditer(periods):
+			line_text = line.group()
+
+			if "." not in line_text:
+				continue
+
+			lengths = list(map(len, line_text.split(". ")))
+			last = len(lengths) - 1
+
+			#Where every sentence starts in the replaced text, each one ending past its terminator and the space after it
+			bounds = list(accumulate(map(add, lengths, repeat(2)), initial=line.start()))
+			bounds[-1] = line.end()
+
+			kept = list(compress(range(last), map(minimum.__lt__, lengths)))
+			texts.extend([replaced[bounds[index]:bounds[index + 1]] for index in kept])
+			starts.extend(map(bounds.__getitem__, kept))
+			ends.extend([bounds[index + 1] for index in kept])
+
+			rest = replaced[bounds[last]:bounds[-1]]
+
+			if paragraph_end and line.end() == len(replaced):
+				rest += "@"
+
+			#The end of a paragraph keeps its '@', any other last sentence gets its period unless the line had one
+			if len(rest) > minimum:
+				if rest.find("@") != -1:
+					ending = ""
+				elif text[self.moved(bounds[-1], word_ends, moves) - 1] in TERMINATORS:
+					ending = " "
+				else:
+					ending = ". "
+
+				texts.append(rest + ending)
+				starts.append(bounds[last])
+				ends.append(bounds[-1])
+
+		#Replaced words before an offset moved it, so move it back to where it was in the text
+		if word_ends is not None:
+			starts = [start + moves[bisect_right(word_ends, start) - 1] for start in starts]
+			ends = [end + moves[bisect_right(word_ends, end) - 1] for end in ends]
+
+		if offset:
+			starts = map(offset.__add__, starts)
+			ends = map(offset.__add__, ends)
+
+		sentences.add(texts, starts, ends)
+
+		return sentences
+
+
+	def replace(self, text):
+		"""
+		Function that returns the text with the words of the lexicon replaced, where
+		every replaced word ends in the new text and how far the text is ahead of the new
+		text from there on, starting with 0 before the first word. Both are None when the
+		text holds none of the words.
+
+		Parameters:
+			1) text - the text to replace words in
+		"""
+
+		if self.words is None:
+			return text, None, None
+
+		#The text between the words, each followed by the word it ends at
+		pieces = self.words.split(text)
+		if len(pieces) == 1:
+			return text, None, None
+
+		between = pieces[::2]
+		words = pieces[1::2]
+		replaced = list(map(self.replacer.replacements.__getitem__, words))
+
+		kept = list(map(len, between[:-1]))
+		text_ends = accumulate(map(add, kept, map(len, words)), initial=0)
+		word_ends = list(accumulate(map(add, kept, map(len, replaced)), initial=0))
+
+		pieces[1::2] = replaced
+
+		return "".join(pieces), word_ends, list(map(sub, text_ends, word_ends))
+
+
+
+	@staticmethod
+	def moved(position, word_ends, moves):
+		"""
+		Function that returns where a position of the replaced text was in the text.
+
+		Parameters:
+			1) position - the position in the replaced text
+			2) word_ends - where every replaced word ends in the replaced text, as returned by replace
+			3) moves - how far the text is ahead from there on, as returned by replace
+		"""
+
+		if word_ends is None:
+			return position
+
+		return position + moves[bisect_right(word_ends, position) - 1]
@@ -0,0 +1,261 @@
+from Fetcher import Fetcher
+from HttpCache import HttpCache
+from Info import article_info, title_to_url
+from ResultCache import ResultCache
+from Sinks import Result
+from Summarizer import Summarizer
+from TextExtractor import EXTRACTORS, parse_page
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import http.client
+import json
+
+summarizer = None
+
+def init_worker(keyword_limit, sentence_limit, result_cache_dir):
+	"""
+	Build the Summarizer each worker process reuses for all of its articles.
+
+	Parameters:
+		1) keyword_limit - use this many keywords when using algorithm
+		2) sentence_limit - floating percentange that limits the amount of sentences gathered
+		3) result_cache_dir - directory of the on-disk tier of the result cache, or None
+	"""
+
+	global summarizer
+	summarizer = Summarizer(None, keyword_limit, sentence_limit, result_cache=ResultCache(directory=result_cache_dir))
+
+
+def summarize_html(html, extractor):
+	"""
+	Function run by the worker processes to parse and summarize a downloaded page.
+	Returns a dict that can be sent back as JSON.
+
+	Parameters:
+		1) html - the downloaded page
+		2) extractor - backend used to parse the page
+	"""
+
+	page = parse_page(html, extractor)
+	title, url = article_info(page)
+
+	return Result(title, url, summarizer.summarize(page.text)).to_dict()
+
+
+class Server:
+	"""
+	Class that serves summaries over HTTP from an asyncio event loop.
+
+	GET /summary?title=Python or GET /summary?url=https://... answers with the summary as
+	JSON, urls are only fetched from the wiki hosts the server allows. Requests for an article that is already being worked on wait for that work
+	instead of starting it again. Downloads run in a thread pool and the CPU heavy parsing
+	and summarizing run in a process pool so the event loop is never blocked.
+	"""
+
+	def __init__(self, fetcher, extractor="soup", workers=None, keyword_limit=25, sentence_limit=0.65, fetch_threads=32, result_cache_dir=None, hosts=("en.wikipedia.org",)):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) fetcher - Fetcher used to download the articles
+			2) extractor - backend used to parse the pages, see TextExtractor.EXTRACTORS
+			3) workers - number of processes summarizing, defaults to the number of cores
+			4) keyword_limit - use this many keywords when using algorithm
+			5) sentence_limit - floating percentange that limits the amount of sentences gathered
+			6) fetch_threads - maximum number of downloads at the same time
+			7) result_cache_dir - directory where finished summaries are kept between runs, or None
+			8) hosts - wiki hosts whose articles may be asked for by url, so the server is never made to fetch anything else
+		"""
+
+		self.fetcher = fetcher
+		self.hosts = frozenset(host.lower() for host in hosts)
+		self.extractor = extractor
+		self.fetch_pool = ThreadPoolExecutor(max_workers=fetch_threads)
+		self.work_pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(keyword_limit, sentence_limit, result_cache_dir))
+
+		#Article url to the task working on it, shared by every request for that url
+		self.in_flight = {}
+
+
+	async def summarize(self, url):
+		"""
+		Function that returns the summary of a url, joining the work already in flight for it.
+
+		Parameters:
+			1) url - the article to summarize
+		"""
+
+		task = self.in_flight.get(url)
+
+		if task is None:
+			task = asyncio.ensure_future(self.work(url))
+			self.in_flight[url] = task
+			task.add_done_callback(lambda done: self.in_flight.pop(url, None))
+
+		#Shield so a client hanging up does not cancel the work other clients wait on
+		return await asyncio.shield(task)
+
+
+	async def work(self, url):
+		"""
+		Function that downloads, parses and summarizes a url.
+
+		Parameters:
+			1) url - the article to summarize
+		"""
+
+		loop = asyncio.get_running_loop()
+		html = await loop.run_in_executor(self.fetch_pool, self.fetcher.fetch, url)
+		return await loop.run_in_executor(self.work_pool, summarize_html, html, self.extractor)
+
+
+	async def handle(self, reader, writer):
+		"""
+		Serve the requests of one client connection, keeping it open between requests.
+
+		Parameters:
+			1) reader - asyncio stream to read the requests from
+			2) writer - asyncio stream to write the responses to
+		"""
+
+		try:
+			while True:
+				request_line = await reader.readline()
+				if not request_line:
+					break
+
+				headers = {}
+				while True:
+					line = await reader.readline()
+					if line in (b"\r\n", b"\n", b""):
+						break
+					name, _, value = line.decode("latin-1").partition(":")
+					headers[name.strip().lower()] = value.strip()
+
+				parts = request_line.decode("latin-1").split()
+				method, target, version = (parts + ["", "", ""])[:3]
+
+				status, body = await self.respond(method, target)
+				keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+				payload = json.dumps(body).encode("utf-8")
+				writer.write("HTTP/1.1 {} {}\r\n".format(status, http.client.responses.get(status, "")).encode("latin-1"))
+				writer.write(b"Content-Type: application/json\r\n")
+				writer.write("Content-Length: {}\r\n".format(len(payload)).encode("latin-1"))
+				writer.write(b"Connection: keep-alive\r\n\r\n" if keep_alive else b"Connection: close\r\n\r\n")
+				writer.write(payload)
+				await writer.drain()
+
+				if not keep_alive:
+					break
+
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+
+		finally:
+			writer.close()
+
+
+	async def respond(self, method, target):
+		"""
+		Function that returns the status and the JSON body answering a request.
+
+		Parameters:
+			1) method - the HTTP method of the request
+			2) target - the path and query of the request
+		"""
+
+		if method != "GET":
+			return 405, {"error": "Only GET is supported"}
+
+		parts = urlsplit(target)
+		if parts.path != "/summary":
+			return 404, {"error": "Unknown path"}
+
+		query = parse_qs(parts.query)
+		if "url" in query:
+			url = query["url"][0]
+			if not self.allowed(url):
+				return 400, {"error": "Please provide the url of an article on {}!".format(", ".join(sorted(self.hosts)))}
+		elif "title" in query and query["title"][0]:
+			url = title_to_url(query["title"][0])
+		else:
+			return 400, {"error": "Please provide a title or url to query!"}
+
+		try:
+			return 200, await self.summarize(url)
+		except HTTPError as e:
+			#A missing article is the client's mistake, only a failing wiki is a bad gateway
+			return e.code if 400 <= e.code < 500 else 502, {"error": str(e), "url": url}
+		except OSError as e:
+			return 502, {"error": str(e), "url": url}
+		except Exception as e:
+			return 500, {"error": str(e), "url": url}
+
+
+	def allowed(self, url):
+		"""
+		Function that returns whether a url asked for is an article of one of the allowed hosts.
+
+		Parameters:
+			1) url - the url from the query
+		"""
+
+		parts = urlsplit(url)
+
+		#The whole netloc is compared, so neither a user name nor another port gets through
+		return parts.scheme in ("http", "https") and parts.netloc.lower() in self.hosts and parts.path.startswith("/wiki/")
+
+
+	async def serve(self, host, port):
+		"""
+		Serve requests until the process is stopped.
+
+		Parameters:
+			1) host - address to listen on
+			2) port - port to listen on
+		"""
+
+		server = await asyncio.start_server(self.handle, host, port)
+
+		async with server:
+			await server.serve_forever()
+
+
+	def close(self):
+		"""Stop the download threads and the worker processes."""
+
+		self.fetch_pool.shutdown()
+		self.work_pool.shutdown()
+
+
+def main():
+	"""Driver function to run the service."""
+	parser = argparse.ArgumentParser(description="Serve wikipedia summaries over HTTP.")
+	parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+	parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+	parser.add_argument("--workers", type=int, help="processes summarizing, defaults to the number of cores")
+	parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="soup", help="backend used to turn pages into text")
+	parser.add_argument("--cache-dir", help="keep downloaded pages in this directory and revalidate them")
+	parser.add_argument("--cache-size", type=int, default=512, help="size cap of the page cache in megabytes")
+	parser.add_argument("--result-cache-dir", help="keep finished summaries in this directory between runs")
+	parser.add_argument("--wiki-host", action="append", help="host, with its port when it is not the default, whose articles may be asked for by url, can be given more than once, defaults to en.wikipedia.org")
+	args = parser.parse_args()
+
+	cache = HttpCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None
+	server = Server(Fetcher(cache), args.extractor, args.workers, result_cache_dir=args.result_cache_dir, hosts=args.wiki_host or ("en.wikipedia.org",))
+
+	try:
+		asyncio.run(server.serve(args.host, args.port))
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.close()
+		if cache:
+			cache.flush()
+
+if __name__ == "__main__":
+	main()
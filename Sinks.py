@@ -0,0 +1,262 @@
+from Files import replace_file
+from urllib.parse import quote
+import hashlib
+import json
+import os
+import sys
+import threading
+
+#Longest summary file name without its '.txt', most file systems allow 255 bytes
+MAX_NAME = 200
+
+class Result:
+	"""Class that holds the summary of one article and what it was made from."""
+
+	def __init__(self, title, url, summary, name=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) title - title of the article
+			2) url - url of the article, or None
+			3) summary - the summary as a list of sentences and paragraphs
+			4) name - name the result is filed under, such as the title that was asked for, defaults to the title
+		"""
+
+		self.title = title
+		self.url = url
+		self.summary = summary
+		self.name = name or title or "untitled"
+
+
+	def to_text(self):
+		"""Function that returns the result in the layout of the summary files."""
+
+		lines = ["Title: {}\n".format(self.title), "Url: {}\n".format(self.url)]
+		lines.extend("\t" + sent + "\n" for sent in self.summary)
+
+		return "".join(lines)
+
+
+	def to_dict(self):
+		"""Function that returns the result as a dict that can be written as JSON."""
+
+		return {"title": self.title, "url": self.url, "summary": self.summary}
+
+
+def output_path(output_dir, title):
+	"""
+	Build the path of the summary file for a title inside the output directory. Every
+	character that cannot be in a file name is percent-encoded, so different titles
+	never share a file.
+
+	Parameters:
+		1) output_dir - directory holding one summary file per title
+		2) title - the title the summary belongs to
+	"""
+
+	name = quote(title, safe=" ") or "untitled"
+
+	#A leading dot would hide the file
+	if name.startswith("."):
+		name = "%2E" + name[1:]
+
+	#Titles too long for a file name keep their start and a hash of the whole title,
+	#'%~' is never made by quote so these names never match an encoded title
+	if len(name) > MAX_NAME:
+		name = name[:MAX_NAME - 34] + "%~" + hashlib.sha1(title.encode("utf-8")).hexdigest()[:32]
+
+	return os.path.join(output_dir, name + ".txt")
+
+
+class FileSink:
+	"""
+	Class that writes every result to its own text file. A file is written under a
+	temporary name and renamed into place, so readers and concurrent runs never see
+	half of a summary.
+	"""
+
+	def __init__(self, output_dir=".", path=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) output_dir - directory that will hold one summary file per title
+			2) path - write every result to this one file instead, as a single article run does
+		"""
+
+		self.output_dir = output_dir
+		self.path = path
+
+		if path is None:
+			os.makedirs(output_dir, exist_ok=True)
+
+
+	def write(self, result):
+		"""
+		Write a result and return the path of its file.
+
+		Parameters:
+			1) result - the Result to write
+		"""
+
+		path = self.path or output_path(self.output_dir, result.name)
+
+		#Summaries are for everyone, not only the user who made them
+		replace_file(path, result.to_text(), 0o644)
+
+		return path
+
+
+	def flush(self):
+		"""Function that does nothing, every file is complete once written."""
+
+		pass
+
+
+	def close(self):
+		"""Function that does nothing, every file is complete once written."""
+
+		pass
+
+
+class JsonLinesSink:
+	"""
+	Class that appends every result as one JSON line to a single file, for batch runs.
+	Lines are buffered and written together, and the lock keeps the lines of
+	concurrent workers whole.
+	"""
+
+	def __init__(self, path, buffer_size=64):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) path - the file the results are appended to
+			2) buffer_size - how many results are kept before they are written
+		"""
+
+		self.path = path
+		self.buffer_size = buffer_size
+		self.buffer = []
+		self.lock = threading.Lock()
+		self.file = open(path, "a", encoding="utf-8")
+
+
+	def write(self, result):
+		"""
+		Add a result to the stream and return the path of the stream.
+
+		Parameters:
+			1) result - the Result to write
+		"""
+
+		line = json.dumps(result.to_dict()) + "\n"
+
+		with self.lock:
+			self.buffer.append(line)
+			if len(self.buffer) >= self.buffer_size:
+				self.flush_buffer()
+
+		return self.path
+
+
+	def flush_buffer(self):
+		"""Write the buffered lines, the lock must be held."""
+
+		self.file.write("".join(self.buffer))
+		self.file.flush()
+		self.buffer.clear()
+
+
+	def flush(self):
+		"""Write the buffered lines."""
+
+		with self.lock:
+			self.flush_buffer()
+
+
+	def close(self):
+		"""Write the buffered lines and close the file."""
+
+		with self.lock:
+			self.flush_buffer()
+			self.file.close()
+
+
+class StdoutSink:
+	"""Class that prints every result, one whole result at a time."""
+
+	def __init__(self, stream=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) stream - text stream to print to, defaults to stdout
+		"""
+
+		self.stream = stream or sys.stdout
+		self.lock = threading.Lock()
+
+
+	def write(self, result):
+		"""
+		Print a result.
+
+		Parameters:
+			1) result - the Result to print
+		"""
+
+		with self.lock:
+			self.stream.write(result.to_text())
+			self.stream.flush()
+
+		return "-"
+
+
+	def flush(self):
+		"""Function that does nothing, every result is printed once written."""
+
+		pass
+
+
+	def close(self):
+		"""Function that does nothing, every result is printed once written."""
+
+		pass
+
+
+class CollectSink:
+	"""Class that keeps the results in memory for callers that use them directly."""
+
+	def __init__(self):
+		"""Initialization function for this class."""
+
+		self.results = []
+		self.lock = threading.Lock()
+
+
+	def write(self, result):
+		"""
+		Keep a result.
+
+		Parameters:
+			1) result - the Result to keep
+		"""
+
+		with self.lock:
+			self.results.append(result)
+
+		return None
+
+
+	def flush(self):
+		"""Function that does nothing."""
+
+		pass
+
+
+	def close(self):
+		"""Function that does nothing."""
+
+		pass
@@ -1,79 +1,233 @@
-from urllib.request import urlopen
-from bs4 import BeautifulSoup
-from collections import OrderedDict
+from Lexicons import load_ignored_words, load_replacements
+from Metrics import NULL_METRICS
+from Segmenter import LINE, Segmenter, Sentences
+from TextRank import TextRank
+from VectorScorer import VectorScorer
+from Vocabulary import Vocabulary
+from collections import Counter
+from itertools import repeat
+import hashlib
+import heapq
+import math
+import os
+import re
+
+#A period that is directly followed by something other than a space
+MISSING_SPACE = re.compile(r"\.(?=[^ ])")
+
+#Version of the summarizing algorithm, raised whenever a change gives other summaries
+#for the same settings so results cached before it are not served
+VERSION = 2
+
+#Ways keywords and sentences can be scored
+SCORINGS = ("count", "tfidf")
+
+#Ways the best sentences can be picked
+RANKINGS = ("keywords", "textrank")
 
 class Summarizer:
-	"""Class that handles the summarizing for an article."""
+	"""
+	Class that handles the summarizing for an article.
 
-	def __init__(self, url, keyword_limit, sentence_limit):
+	The configuration is set once at construction and nothing is stored on the instance
+	while summarizing, so one Summarizer can serve any number of articles and threads.
+	"""
+
+	def __init__(self, url=None, keyword_limit=25, sentence_limit=0.65, fetcher=None, extractor="soup", ignored_words=None, replacer=None, result_cache=None, scoring="count", df_index=None, update_index=True, vectorized=False, ranking="keywords", text_rank=None):
 		"""
 		Initialization function for this class.
 
 		Parameters:
-			1) url - url to visit to gather information
+			1) url - url clean_text visits when it is not given a page, None for an engine that is only given text
 			2) keyword_limit - use this many keywords when using algorithm
 			3) sentence_limit - floating percentange that limits the amount of sentences gathered
+			4) fetcher - Fetcher used when clean_text has to download the url itself
+			5) extractor - backend used when clean_text has to parse the url itself, see TextExtractor.EXTRACTORS
+			6) ignored_words - set of words that are never keywords, defaults to the shared ignored words lexicon
+			7) replacer - Lexicons.Replacer used on abbreviations, defaults to the shared replaced words lexicon
+			8) result_cache - ResultCache that remembers summaries of text that was already summarized, not used when the tfidf scoring updates the index
+			9) scoring - 'count' ranks by raw occurences, 'tfidf' weighs them with the document frequency index
+			10) df_index - DocumentFrequency used by the 'tfidf' scoring
+			11) update_index - add every summarized article to df_index so the index grows as articles are processed
+			12) vectorized - rank sentences with NumPy through a VectorScorer, which needs NumPy installed
+			13) ranking - 'keywords' picks the sentences with the most keywords, 'textrank' the most central ones of a similarity graph
+			14) text_rank - TextRank with the caps used by the 'textrank' ranking, needs NumPy installed
 		"""
 
+		if scoring not in SCORINGS:
+			raise ValueError("Unknown scoring: {}".format(scoring))
+
+		if scoring == "tfidf" and df_index is None:
+			raise ValueError("The tfidf scoring needs a document frequency index")
+
+		if ranking not in RANKINGS:
+			raise ValueError("Unknown ranking: {}".format(ranking))
+
 		self.url = url
+		self.fetcher = fetcher
+		self.extractor = extractor
 		self.keyword_limit = keyword_limit
 		self.sentence_limit = sentence_limit
-		self.sent_count = None
-		self.ignored_words = set([])
-		self.dict = {}
+		self.ignored_words = load_ignored_words() if ignored_words is None else ignored_words
+		self.replacer = load_replacements() if replacer is None else replacer
+		self.segmenter = Segmenter(self.replacer)
+		self.scoring = scoring
+		self.df_index = df_index
+		self.update_index = update_index
 
+		#A growing index changes the weights of every article it has seen, so their summaries cannot be kept
+		self.result_cache = None if scoring == "tfidf" and update_index else result_cache
+		self.vector_scorer = VectorScorer() if vectorized else None
+		self.ranking = ranking
+		self.text_rank = None
 
-	def fill_ignored(self):
-		"Generate a set to hold the ignored words such as 'The', 'a', etc"
-		with open("ignored_words/ignored_words.txt", "r") as ignored_words:
-			for ignored_word in ignored_words:
-				ignored_word = ignored_word.strip()
-				self.ignored_words.add(ignored_word)
-				self.ignored_words.add(ignored_word[0].lower() + ignored_word[1:])
+		if ranking == "textrank":
+			self.text_rank = text_rank or TextRank()
+		self.lexicon_digest = self.digest_lexicons()
 
 
-	def clean_text(self):
-		"""Clean up the text by removing whitespaces and various other unneeded material."""
+	def digest_lexicons(self):
+		"""Function that returns a short hash of the lexicons so cached results change when they do."""
 
-		lines = []
-		unclean_text = []
-		buffer = []
+		digest = hashlib.sha1()
+		for word in sorted(self.ignored_words):
+			digest.update(word.encode("utf-8") + b"\0")
+		for word, replacement in sorted(self.replacer.replacements.items()):
+			digest.update(word.encode("utf-8") + b"=" + replacement.encode("utf-8") + b"\0")
 
-		response = urlopen(self.url)
-		html = response.read()
-		soup = BeautifulSoup(html, "html.parser")
+		return digest.hexdigest()[0:16]
 
-		# kill all script and style elements
-		for script in soup(["script", "style"]):
-			script.extract()
 
-		text = soup.get_text()
+	def parameters(self):
+		"""Function that returns a string describing every setting that changes a summary."""
 
-		#remove leading and trailing space on every line
-		for line in text.splitlines():
-			lines.append(line.strip())
+		ranking = self.text_rank.parameters() if self.text_rank else self.ranking
+		scoring = self.scoring
 
-		#split lines into singular lines
-		for line in lines:
-			for word in line.split("  "):
-				unclean_text.append(word.strip())
+		#The weights depend on which index was used and how many documents it had
+		if scoring == "tfidf":
+			scoring += " index={} documents={}".format(os.path.realpath(self.df_index.path), self.df_index.documents)
 
-		#remove empty lines
-		for sent in unclean_text:
-			if sent:
-				buffer.append(sent)
+		return "version={} keywords={} sentences={} lexicons={} scoring={} ranking={}".format(VERSION, self.keyword_limit, self.sentence_limit, self.lexicon_digest, scoring, ranking)
 
-		#If a sentence is less than 100 characters long, remove them from the text
-		text = self.shorten_text(buffer)
 
-		#Re add spaces where it is necessary
-		text = self.add_spaces(text)
+	def summarize(self, text, metrics=None, name=None):
+		"""
+		Function that cleans the text of a page and returns its summary.
+
+		Parameters:
+			1) text - the visible text of the page
+			2) metrics - Metrics that record the time spent in every stage, or None
+			3) name - what identifies the article in the document frequency index, such as its url, or None
+		"""
+
+		return self.summarize_batch([text], metrics, [name])[0]
+
+
+	def summarize_batch(self, texts, metrics=None, names=None):
+		"""
+		Function that cleans the text of many pages and returns their summaries, ranking
+		the sentences of all of them at once. Every page is cleaned and split in one
+		stream, so its sentences are the only copy of it that is kept.
+
+		Parameters:
+			1) texts - the visible text of every page
+			2) metrics - Metrics that record the time spent in every stage, or None
+			3) names - what identifies every article in the document frequency index, or None
+		"""
+
+		metrics = metrics or NULL_METRICS
+		summaries = [None] * len(texts)
+		keys = [None] * len(texts)
+		pending = []
+
+		for position, text in enumerate(texts):
+			metrics.count("characters_extracted", len(text))
+
+			#Pages are looked up by their own text, so a page summarized before is not even cleaned
+			if self.result_cache is not None:
+				keys[position] = self.result_cache.key(text, self.parameters() + " input=page")
+				cached = self.result_cache.get(keys[position])
+				if cached is not None:
+					metrics.count("result_cache_hits")
+					summaries[position] = cached
+					continue
+				metrics.count("result_cache_misses")
+
+			pending.append(position)
+
+		#Cleaning runs as the lines are read, so its time is added up line by line
+		streams = [metrics.timed("clean", self.clean_lines(texts[position])) for position in pending]
+
+		names = [names[position] for position in pending] if names else None
+
+		for position, summary in zip(pending, self.grab_summaries(streams, metrics, [keys[position] for position in pending], names)):
+			summaries[position] = summary
+
+		return summaries
+
+
+	def clean_text(self, page=None, metrics=None):
+		"""
+		Clean up the text by removing whitespaces and various other unneeded material.
+
+		Parameters:
+			1) page - already parsed TextExtractor.Page to clean, the url is only fetched and parsed when this is not given
+			2) metrics - Metrics that record the time spent in every stage, or None
+		"""
+
+		metrics = metrics or NULL_METRICS
+
+		if page is None:
+			#Only pay for the network and parser imports when the page is not given
+			from Fetcher import Fetcher
+			from TextExtractor import parse_page
+
+			with metrics.stage("fetch"):
+				html = (self.fetcher or Fetcher()).fetch(self.url, metrics)
+			with metrics.stage("parse"):
+				page = parse_page(html, self.extractor)
+
+		#Script and style contents were already dropped by the extractor
+		return self.clean(page.text, metrics)
+
+
+	def clean(self, text, metrics=None):
+		"""
+		Function that removes whitespaces and short pieces from the visible text of a page.
+
+		Parameters:
+			1) text - the text to clean
+			2) metrics - Metrics that record the time spent cleaning, or None
+		"""
+
+		metrics = metrics or NULL_METRICS
+		metrics.count("characters_extracted", len(text))
 
-		text = '\n'.join(text)
+		with metrics.stage("clean"):
+			text = '\n'.join(self.clean_lines(text))
 
 		return text
 
 
+	def clean_lines(self, text):
+		"""
+		Generator that yields the cleaned lines of the visible text of a page one at a time.
+
+		Parameters:
+			1) text - the text to clean
+		"""
+
+		#split lines into singular lines on double spaces, removing leading and trailing space
+		pieces = (piece.strip() for line in LINE.finditer(text) for piece in line.group().split("  "))
+
+		#If a sentence is less than 100 characters long, drop it, empty lines included
+		pieces = (piece for piece in pieces if len(piece) > 100)
+
+		#Re add spaces where it is necessary
+		return (MISSING_SPACE.sub(". ", piece) for piece in pieces)
+
+
 	@staticmethod
 	def add_spaces(text):
 		"""
@@ -83,18 +237,7 @@ class Summarizer:
 			1) text - the text to re-add spaces to
 		"""
 
-		count = 0
-		spaced_text = []
-
-		for sent in text:
-			while count < len(sent) - 1:
-				if sent[count] == "." and sent[count + 1] != " ":
-					sent = sent[0:count + 1] + " " + sent[count+1:]
-				count += 1
-			spaced_text.append(sent)
-
-
-		return spaced_text
+		return [MISSING_SPACE.sub(". ", sent) for sent in text]
 
 
 	@staticmethod
@@ -106,83 +249,200 @@ class Summarizer:
 			1) text - the text to shorten
 		"""
 
-		new_list = []
-
-		for sent in text:
-			if len(sent) > 100:
-				new_list.append(sent)
+		return [sent for sent in text if len(sent) > 100]
 
-		return new_list
 
-
-	def grab_keywords(self, text):
+	def grab_keywords(self, text, name=None):
 		"""
 		Function used to obtain the keywords for the article.
 
 		Parameters:
 			1) text - the text to gather keywords from.
+			2) name - what identifies the article in the document frequency index, or None
+		"""
+
+		text = self.tokenize(text)
+
+		return self.pick_keywords(self.count_keywords(text), text.vocabulary, name)
+
+
+	def pick_keywords(self, counts, vocabulary, name=None):
+		"""
+		Function that picks the keywords of an article out of the counts of its words,
+		weighting them by inverse document frequency when that scoring is used.
+
+		Parameters:
+			1) counts - dict of the Vocabulary id of every word that can be a keyword to its occurences, in the order the words were first seen in
+			2) vocabulary - Vocabulary.Vocabulary the ids belong to
+			3) name - what identifies the article in the document frequency index, None identifies it by its words
+		"""
+
+		words = vocabulary.words
+
+		if self.scoring == "tfidf":
+			#The index grows with every new article processed, this one included
+			if self.update_index:
+				self.df_index.add_document((words[token] for token in counts), name)
+
+			counts = {token: count * self.df_index.idf(words[token]) for token, count in counts.items()}
+
+		return [words[token] for token in self.top_keywords(counts)]
+
+
+	def count_keywords(self, text):
+		"""
+		Function that counts the words that can be keywords, capitalized and not ignored.
+		Returns a dict of the Vocabulary id of every such word to its occurences, the
+		words are kept in the order they were first seen in.
+
+		Parameters:
+			1) text - the sentences to count words in
+		"""
+
+		text = self.tokenize(text)
+
+		return self.count_tokens(text.tokens, text.vocabulary)
+
+
+	def count_tokens(self, tokens, vocabulary):
+		"""
+		Function that counts the words that can be keywords among Vocabulary ids, like count_keywords.
+
+		Parameters:
+			1) tokens - iterable of the Vocabulary ids of the words
+			2) vocabulary - Vocabulary.Vocabulary the ids belong to
+		"""
+
+		#Whether a word can be a keyword was worked out once, when it got its id
+		return Counter(filter(vocabulary.candidates.__getitem__, tokens))
+
+
+	def tokenize(self, text):
+		"""
+		Function that returns the sentences with the ids of their words, tokenizing them
+		with a new Vocabulary unless the segmenter already did.
+
+		Parameters:
+			1) text - the sentences, split by the segmenter or plain strings
 		"""
 
-		keywords = []
-		counter = 0
+		if getattr(text, "vocabulary", None) is not None:
+			return text
 
-		text = [word for sent in text for word in sent.split() if word not in self.ignored_words and word[0].isupper()]
+		#Sentences sent from another process keep their offsets, plain strings have none
+		starts = getattr(text, "starts", repeat(0, len(text)))
+		ends = getattr(text, "ends", repeat(0, len(text)))
 
-		for word in text:
-			#if the word is in the dictionary, increment it
-			if word in self.dict:
-				self.dict[word] += 1
+		return Sentences(text, starts, ends, self.new_vocabulary())
 
-			#if the word is not in the dictionary, add it as an entry
-			else:
-				self.dict[word] = 0
 
+	def new_vocabulary(self):
+		"""Function that returns the Vocabulary of a new document, its ids only mean something for that document."""
 
-		#Order the dictionary so the words with the most occurence is at the top
-		self.dict = OrderedDict(sorted(self.dict.items(), key=lambda t: t[1], reverse=True))
+		return Vocabulary(self.ignored_words)
 
-		#Place these words into a list
-		for k, v in self.dict.items():
-			if counter != self.keyword_limit:
-				keywords.append(k)
-				counter += 1
 
-		return keywords
+	def top_keywords(self, counts):
+		"""
+		Function that picks the keywords out of the counted words.
+
+		Parameters:
+			1) counts - dict of word to occurences, in the order the words were first seen in
+		"""
+
+		#Take the words with the most occurences, ties keep the order the words were first seen in
+		return heapq.nlargest(self.keyword_limit, counts, key=counts.get)
 
 
-	def grab_summary(self, text):
+	def grab_summary(self, text, metrics=None):
 		"""
 		Driver function that will gather the summary to return.
 
 		Parameters:
 			1) text - text to obtain summary from.
+			2) metrics - Metrics that record the time spent in every stage, or None
 		"""
 
-		summary = []
+		return self.grab_summaries([text], metrics)[0]
 
 
-		#Mark the end of paragraphs in order to group properly
-		text = self.mark_end_of_paragraphs(text)
-
-		text = self.split_text(text)
+	def grab_summaries(self, texts, metrics=None, keys=None, names=None):
+		"""
+		Driver function that will gather the summary of every text. The sentences of all
+		the texts are ranked in one call so a vectorized ranking pays its overhead once.
 
-		self.sent_count = len(text)
+		Parameters:
+			1) texts - the texts to obtain summaries from, each either a string or an iterable of its lines.
+			2) metrics - Metrics that record the time spent in every stage, or None
+			3) keys - the result cache key of every text when the caller already looked it up, or None
+			4) names - what identifies every text in the document frequency index, or None
+		"""
 
-		#Obtain the keywords
-		keywords = self.grab_keywords(text)
+		summaries = [None] * len(texts)
+		documents = []
+		metrics = metrics or NULL_METRICS
+
+		for position, text in enumerate(texts):
+			key = keys[position] if keys else None
+			digest = None
+
+			#Text that was already summarized with the same settings skips all the work below,
+			#unless the caller already looked it up under its own key
+			if key is None and self.result_cache is not None and isinstance(text, str):
+				key = self.result_cache.key(text, self.parameters())
+				cached = self.result_cache.get(key)
+				if cached is not None:
+					metrics.count("characters_processed", len(text))
+					metrics.count("result_cache_hits")
+					summaries[position] = cached
+					continue
+				metrics.count("result_cache_misses")
+
+			#Streamed lines can only be hashed as they are read
+			elif key is None and self.result_cache is not None:
+				digest = self.result_cache.digest(self.parameters())
+
+			#Lines streamed from clean_lines are cleaned while they are split, each into its own stage
+			lines = metrics.timed("split", iter_lines(text)) if isinstance(text, str) else text
+			text, characters = self.read_sentences(lines, digest, metrics)
+
+			metrics.count("characters_processed", characters)
+
+			if digest is not None:
+				key = digest.hexdigest()
+				cached = self.result_cache.get(key)
+				if cached is not None:
+					metrics.count("result_cache_hits")
+					summaries[position] = cached
+					continue
+				metrics.count("result_cache_misses")
+
+			metrics.count("sentences", len(text))
+
+			#Obtain the keywords
+			with metrics.stage("keywords"):
+				keywords = self.grab_keywords(text, names[position] if names else None)
+
+			documents.append((position, key, text, keywords))
 
 		#Gather the best ranked sentences by indices
-		best_sentences = self.rank_sentences(text, keywords)
+		with metrics.stage("rank"):
+			ranked = self.rank_documents([(text, keywords) for _, _, text, keywords in documents])
+
+		for (position, key, text, _), best_sentences in zip(documents, ranked):
+			#Append the actual sentences to a list
+			summary = [str(text[index]) for index in best_sentences]
 
-		#Append the actual sentences to a list
-		for index in best_sentences:
-			summary.append(str(text[index]))
+			#Attempt to group the sentences together in paragraphs
+			with metrics.stage("group"):
+				summary = self.group_summary(summary)
 
+			if key is not None:
+				self.result_cache.put(key, summary)
 
-		#Attempt to group the sentences together in paragraphs
-		summary = self.group_summary(summary)
+			summaries[position] = summary
 
-		return summary
+		return summaries
 
 
 	@staticmethod
@@ -211,87 +471,99 @@ class Summarizer:
 		return grouped_summary
 
 
-	def split_text(self, text):
+	def read_sentences(self, lines, digest=None, metrics=None):
 		"""
-		Function that splits text up.
+		Function that splits the lines of a text into sentences, marking the end of every
+		paragraph with '@' like mark_end_of_paragraphs does, one line at a time.
+		Returns the sentences and the number of characters read.
 
 		Parameters:
-			1) text - the text to split up.
+			1) lines - the lines of the text, without line breaks
+			2) digest - hashlib object the text is fed to as it is read, or None
+			3) metrics - Metrics the time spent splitting is added to, or None
 		"""
 
-		sentences = []
-		buffer = []
-		finalized_sentences = []
-		puncts = [".", "?", "!"]
+		metrics = metrics or NULL_METRICS
+		sentences = Sentences(vocabulary=self.new_vocabulary())
+		characters = 0
+		previous = None
 
-		#Replace words to avoid '.'.
-		text = self.replace_text(text)
+		for line in lines:
+			if previous is not None:
+				with metrics.stage("split"):
+					self.split_paragraph(previous, start, True, sentences)
+				characters += 1
+				if digest is not None:
+					digest.update(b"\n")
 
-		for sent in text.splitlines():
-			if self.has_punct(puncts, sent):
-				sentences.append(sent)
+			start = characters
+			characters += len(line)
+			if digest is not None:
+				digest.update(line.encode("utf-8"))
 
-		counter = 0
-		for sent in sentences:
-			if sent.find("!") != -1:
-				fs = sent.split("! ")
+			previous = line
 
-			elif sent.find("?") != -1:
-				fs = sent.split("? ")
+		if previous is not None:
+			with metrics.stage("split"):
+				self.split_paragraph(previous, start, False, sentences)
 
-			else:
-				fs = sent.split(". ")
+		return sentences, characters
 
-			buffer.append(fs)
 
-		#Gather the sentences to group and place periods at the right spots
-		for s in buffer:
-			for t in s:
-				if t != "" and len(t) > 100 and t.find("@") != -1:
-					finalized_sentences.append(t)
-				elif t != "" and len(t) > 100:
-					finalized_sentences.append(t + ". ")
+	def split_paragraph(self, paragraph, offset=0, marked=False, sentences=None):
+		"""
+		Function that splits one paragraph into sentences, returning the Sentences they were added to.
+
+		Parameters:
+			1) paragraph - the paragraph to split up.
+			2) offset - offset of the paragraph in the cleaned text
+			3) marked - whether the last sentence is marked with '@' as the end of the paragraph
+			4) sentences - the Sentences to add to, a new one when None
+		"""
 
-		count = 0
+		return self.segmenter.segment(paragraph, offset, marked, sentences)
 
-		return finalized_sentences
 
-	@staticmethod
-	def replace_text(text):
+	def split_text(self, text, vocabulary=None):
 		"""
-		Function used to replace words such as Mrs., Dr. to avoid confusing program.
+		Function that splits text up, text whose paragraphs are already marked with '@'.
 
 		Parameters:
-			1) text - the text to re-add spaces to
+			1) text - the text to split up.
+			2) vocabulary - Vocabulary.Vocabulary the sentences are tokenized with, a new one when None
 		"""
 
-		with open("replaced_words/replaced_words.txt", "r") as replaced_words:
-			for word in replaced_words:
-				delimiter = word.find("=")
-				replaced_word = word[0:delimiter]
-				replacer = word[delimiter+1:]
+		if vocabulary is None:
+			vocabulary = self.new_vocabulary()
 
-				text = text.replace(replaced_word, replacer)
+		return self.segmenter.segment(text, sentences=Sentences(vocabulary=vocabulary))
 
-		return text
 
-
-	def has_punct(self, puncts, sent):
+	def replace_text(self, text):
 		"""
-		Check to see if the sentence has punctuations.
+		Function used to replace words such as Mrs., Dr. to avoid confusing program.
+		All the words are replaced in a single scan of the text.
 
 		Parameters:
-			1) puncts - list containing '.', '?' '!'
-			2) sent - the sentence to check
+			1) text - the text to replace words in
 		"""
-		for punct in puncts:
-			if sent.find(punct) != -1:
-				return True
 
-		return False
+		return self.replacer.replace(text)
 
 
 	def rank_sentences(self, text, keywords):
+		"""
+		Function that will rank the sentences and return the indices of the best ones.
+
+		Parameters:
+			1) text - the text to check
+			2) keywords - use these to gather the rank the sentences
+		"""
+
+		return self.select_sentences(self.graph_ranks(text, self.keyword_ranks(text, keywords)))
+
+
+	def keyword_ranks(self, text, keywords):
 		"""
 		Function that will rank the sentences by occurence of keywords.
 
@@ -300,26 +572,93 @@ class Summarizer:
 			2) keywords - use these to gather the rank the sentences
 		"""
 
-		sentence_dict = {}
-		sentence_count = 0
-		best_sentences = []
-		count = 0
+		text = self.tokenize(text)
+		weights = self.keyword_weights(keywords, text.vocabulary)
+
+		if self.vector_scorer is not None:
+			return self.vector_scorer.rank(text, weights)
+
+		if self.scoring == "tfidf":
+			return [sum(map(weights.get, sent, repeat(0))) for sent in text.token_arrays()]
+
+		#Hash the keywords once so every word is checked in constant time
+		keywords = set(weights)
+
+		#Check to see how many keywords each sentence has
+		return [self.check_keywords(sent, keywords) for sent in text.token_arrays()]
+
+
+	def graph_ranks(self, text, ranks):
+		"""
+		Function that reranks the sentences with TextRank when that ranking is used.
+
+		Parameters:
+			1) text - the sentences
+			2) ranks - the keyword rank of every sentence
+		"""
+
+		if self.text_rank is None:
+			return ranks
+
+		return self.text_rank.rank(self.tokenize(text), ranks, self.selection_size(len(ranks)))
+
+
+	def rank_documents(self, documents):
+		"""
+		Function that ranks the sentences of many documents, all at once when vectorized.
+		Returns the indices of the best sentences of every document.
+
+		Parameters:
+			1) documents - list of (text, keywords) tuples
+		"""
+
+		if self.vector_scorer is None:
+			return [self.rank_sentences(text, keywords) for text, keywords in documents]
+
+		documents = [(self.tokenize(text), keywords) for text, keywords in documents]
+		ranks = self.vector_scorer.rank_documents([(text, self.keyword_weights(keywords, text.vocabulary)) for text, keywords in documents])
+
+		return [self.select_sentences(self.graph_ranks(text, document_ranks)) for (text, _), document_ranks in zip(documents, ranks)]
+
+
+	def keyword_weights(self, keywords, vocabulary):
+		"""
+		Function that returns how much every keyword adds to the rank of a sentence it is in,
+		as a dict of the Vocabulary id of every keyword to its weight.
+
+		Parameters:
+			1) keywords - the keywords of the article
+			2) vocabulary - Vocabulary.Vocabulary of the article
+		"""
+
+		if self.scoring == "tfidf":
+			#Every keyword in a sentence adds its inverse document frequency
+			return {vocabulary[word]: self.df_index.idf(word) for word in keywords}
 
-		for sent in text:
-			#Check to see how many keywords this sentence has
-			rank = self.check_keywords(sent, keywords)
+		return dict.fromkeys(map(vocabulary.__getitem__, keywords), 1)
 
-			#Create a dictionary that will hold the sentence and their rank
-			sentence_dict[sentence_count] = rank
-			sentence_count += 1
 
-		sentence_dict = OrderedDict(sorted(sentence_dict.items(), key=lambda t: t[1], reverse=True))
+	def selection_size(self, count):
+		"""
+		Function that returns how many sentences the summary keeps out of an article.
 
-		#Gather the best sentences
-		for key, value in sentence_dict.items():
-			if count < self.sentence_limit * self.sent_count:
-				best_sentences.append(key)
-			count += 1
+		Parameters:
+			1) count - number of sentences of the article
+		"""
+
+		return max(0, min(count, math.ceil(self.sentence_limit * count)))
+
+
+	def select_sentences(self, ranks):
+		"""
+		Function that returns the indices of the best ranked sentences in document order.
+
+		Parameters:
+			1) ranks - the rank of every sentence
+		"""
+
+		#Gather the best sentences, ties keep the earliest sentences
+		best_sentences = heapq.nlargest(self.selection_size(len(ranks)), range(len(ranks)), key=ranks.__getitem__)
 
 		best_sentences.sort()
 
@@ -331,18 +670,11 @@ class Summarizer:
 		Function that will check the sentences and keywords.
 
 		Parameters:
-			1) sent - the sentence to check
-			2) keywords - keywords to check sentence against
+			1) sent - the array of Vocabulary ids of the sentence to check
+			2) keywords - set of Vocabulary ids of the keywords to check sentence against
 		"""
 
-		rank = 0
-		split_sent = sent.split()
-
-		for word in split_sent:
-			if keywords.count(word) > 0:
-				rank += 1
-
-		return rank
+		return sum(map(keywords.__contains__, sent))
 
 
 	def mark_end_of_paragraphs(self, text):
@@ -357,14 +689,34 @@ class Summarizer:
 		return text
 
 
-	def print_summary(self, summary):
+	def print_summary(self, summary, output="summary.txt"):
 		"""
 		Function to print the summary.
 
 		Parameters:
 			1) summary - the summary to print to the text file
+			2) output - path of the text file to append to
 		"""
 
-		with open("summary.txt", "ab") as f:
+		with open(output, "ab") as f:
 			for sent in summary:
 				f.write(("\t" + sent + "\n").encode('utf-8'))
+
+
+def iter_lines(text):
+	"""
+	Generator that yields the lines of a text split on newlines, without copying the whole text.
+
+	Parameters:
+		1) text - the text to split
+	"""
+
+	start = 0
+
+	while True:
+		end = text.find("\n", start)
+		if end == -1:
+			yield text[start:]
+			return
+		yield text[start:end]
+		start = end + 1
@@ -0,0 +1,231 @@
+from html.parser import HTMLParser
+import re
+import sys
+
+CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+class Page:
+	"""Class that holds what the rest of the program needs from a downloaded page."""
+
+	def __init__(self, title, links, text, anchors=None):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) title - contents of the first <title> tag, or None
+			2) links - href of every <link> tag in document order
+			3) text - the visible text of the page without script and style contents
+			4) anchors - href of every <a> tag in document order
+		"""
+
+		self.title = title
+		self.links = links
+		self.text = text
+		self.anchors = anchors or []
+
+
+class TextExtractor(HTMLParser):
+	"""
+	Class that pulls the visible text out of a page straight from the parser events,
+	without building a tree. Script and style contents are dropped as they are read.
+	"""
+
+	SKIPPED_TAGS = ("script", "style")
+
+	def __init__(self):
+		"""Initialization function for this class."""
+
+		super().__init__(convert_charrefs=True)
+		self.pieces = []
+		self.title = None
+		self.links = []
+		self.anchors = []
+		self.skip_depth = 0
+		self.in_title = False
+
+
+	def handle_starttag(self, tag, attrs):
+		"""Track the tags whose contents are skipped and record the title and links."""
+
+		if tag in self.SKIPPED_TAGS:
+			self.skip_depth += 1
+
+		elif tag == "title" and self.title is None:
+			self.in_title = True
+			self.title = ""
+
+		elif tag == "link":
+			for name, value in attrs:
+				if name == "href" and value is not None:
+					self.links.append(value)
+
+		elif tag == "a":
+			for name, value in attrs:
+				if name == "href" and value is not None:
+					self.anchors.append(value)
+
+
+	def handle_endtag(self, tag):
+		"""Leave the tags whose contents are skipped."""
+
+		if tag in self.SKIPPED_TAGS and self.skip_depth:
+			self.skip_depth -= 1
+
+		elif tag == "title":
+			self.in_title = False
+
+
+	def handle_data(self, data):
+		"""Keep text that is not inside a script or style tag."""
+
+		if self.skip_depth:
+			return
+
+		if self.in_title:
+			self.title += data
+
+		self.pieces.append(data)
+
+
+	def get_text(self):
+		"""Function that returns the text gathered so far."""
+
+		return "".join(self.pieces)
+
+
+def decode_html(html):
+	"""
+	Function that decodes a downloaded page using the charset it declares, falling back to utf-8.
+
+	Parameters:
+		1) html - the page as bytes
+	"""
+
+	if isinstance(html, str):
+		return html
+
+	match = CHARSET.search(html, 0, 2048)
+	encoding = match.group(1).decode("ascii") if match else "utf-8"
+
+	try:
+		return html.decode(encoding, errors="replace")
+	except LookupError:
+		return html.decode("utf-8", errors="replace")
+
+
+def parse_with_soup(html):
+	"""
+	Function that builds a Page with BeautifulSoup.
+
+	Parameters:
+		1) html - the page to parse
+	"""
+
+	from bs4 import BeautifulSoup
+
+	soup = BeautifulSoup(html, "html.parser")
+
+	title = soup.find("title")
+	if title is not None:
+		title = str(title.contents[0]) if title.contents else ""
+
+	links = [link["href"] for link in soup.find_all("link") if link.has_attr("href")]
+	anchors = [anchor["href"] for anchor in soup.find_all("a") if anchor.has_attr("href")]
+
+	# kill all script and style elements
+	for script in soup(["script", "style"]):
+		script.extract()
+
+	return Page(title, links, soup.get_text(), anchors)
+
+
+def parse_with_stream(html):
+	"""
+	Function that builds a Page with the tree-less TextExtractor.
+
+	Parameters:
+		1) html - the page to parse
+	"""
+
+	extractor = TextExtractor()
+	extractor.feed(decode_html(html))
+	extractor.close()
+
+	return Page(extractor.title, extractor.links, extractor.get_text(), extractor.anchors)
+
+
+#Backends that can be chosen to turn a page into text
+EXTRACTORS = {
+	"soup": parse_with_soup,
+	"stream": parse_with_stream,
+}
+
+
+def parse_page(html, extractor="soup"):
+	"""
+	Function that parses a downloaded page with the chosen backend.
+
+	Parameters:
+		1) html - the page to parse
+		2) extractor - name of the backend in EXTRACTORS
+	"""
+
+	if extractor not in EXTRACTORS:
+		raise ValueError("Unknown extractor: {}".format(extractor))
+
+	return EXTRACTORS[extractor](html)
+
+
+def compare(html, repeat=5):
+	"""
+	Function that times every backend on the same page and measures its peak memory.
+	Returns a dict of backend name to (best seconds, peak bytes, text).
+
+	Parameters:
+		1) html - the page to parse
+		2) repeat - how many times each backend is timed
+	"""
+
+	#Only needed when comparing, so the import is not paid by every run
+	import time
+	import tracemalloc
+
+	results = {}
+
+	for name in EXTRACTORS:
+		best = None
+		for _ in range(repeat):
+			start = time.perf_counter()
+			page = parse_page(html, name)
+			elapsed = time.perf_counter() - start
+			best = elapsed if best is None else min(best, elapsed)
+
+		tracemalloc.start()
+		page = parse_page(html, name)
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+
+		results[name] = (best, peak, page.text)
+
+	return results
+
+
+def main():
+	"""Compare the backends on saved pages given on the command line."""
+	if len(sys.argv) < 2:
+		print("Please provide saved pages to compare!")
+		exit(1)
+
+	for path in sys.argv[1:]:
+		with open(path, "rb") as f:
+			html = f.read()
+
+		results = compare(html)
+		texts = set(result[2] for result in results.values())
+
+		print("{} ({} bytes, same text: {})".format(path, len(html), len(texts) == 1))
+		for name, (seconds, peak, text) in results.items():
+			print("\t{:<8}{:>10.2f} ms{:>12.1f} KiB peak".format(name, seconds * 1000, peak / 1024))
+
+if __name__ == "__main__":
+	main()
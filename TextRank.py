@@ -0,0 +1,203 @@
+import heapq
+import math
+
+#Most sentence pairs made at once while building a graph
+PAIR_BUDGET = 1 << 18
+
+class TextRank:
+	"""
+	Class that ranks sentences by how central they are in a graph of similar sentences.
+
+	Two sentences are linked when they share words, weighted by the shared words over the
+	log of their lengths, and the sentences are scored with PageRank's power iteration.
+	The links are found from the sentences every word is in, so only sentences that do
+	share a word cost anything. Only the best sentences by keyword rank go into the graph
+	and the iteration stops early once the scores settle, so long articles cost no more
+	than max_sentences do.
+	"""
+
+	def __init__(self, max_sentences=400, max_iterations=50, tolerance=1e-6, damping=0.85):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) max_sentences - most sentences put in the graph, the rest keep their keyword rank below them
+			2) max_iterations - most power iteration steps
+			3) tolerance - stop once the scores move less than this in one step
+			4) damping - chance of following a link instead of jumping to a random sentence
+		"""
+
+		#NumPy is only needed by this ranking, so only import it when it is used
+		import numpy
+
+		self.numpy = numpy
+		self.max_sentences = max_sentences
+		self.max_iterations = max_iterations
+		self.tolerance = tolerance
+		self.damping = damping
+
+
+	def parameters(self):
+		"""Function that returns a string describing every setting that changes a ranking."""
+
+		return "textrank({},{},{},{})".format(self.max_sentences, self.max_iterations, self.tolerance, self.damping)
+
+
+	def rank(self, sentences, ranks, limit=None):
+		"""
+		Function that returns the rank of every sentence. The graph keeps the same share
+		of its sentences as the summary keeps of the article, picked by TextRank score and
+		ranked above all the others. The sentences left out of the graph come next in the
+		order of their keyword ranks, and the sentences the graph dropped come last.
+
+		Parameters:
+			1) sentences - the Segmenter.Sentences of the article, tokenized, the ignored words of their Vocabulary do not link sentences
+			2) ranks - the keyword rank of every sentence, used to pick the sentences of the graph
+			3) limit - how many sentences the summary keeps, None keeps every sentence of the graph
+		"""
+
+		#Only the best sentences by keyword rank go into the graph
+		candidates = heapq.nlargest(self.max_sentences, range(len(ranks)), key=ranks.__getitem__)
+		candidates.sort()
+
+		if not candidates:
+			return ranks
+
+		tokens = sentences.tokens
+		bounds = sentences.bounds
+		scores = self.scores([tokens[bounds[index]:bounds[index + 1]] for index in candidates], sentences.vocabulary).tolist()
+
+		if limit is None:
+			keep = len(candidates)
+		else:
+			keep = min(limit, math.ceil(limit * len(candidates) / len(ranks)))
+
+		kept = set(heapq.nlargest(keep, range(len(candidates)), key=scores.__getitem__))
+
+		#Scores are at most 1, so kept sentences rank above every keyword rank and dropped ones below
+		top = max(ranks) + 1
+		bottom = min(ranks) - 2
+		ranks = list(ranks)
+
+		for position, (index, score) in enumerate(zip(candidates, scores)):
+			ranks[index] = (top if position in kept else bottom) + score
+
+		return ranks
+
+
+	def graph(self, sentences, vocabulary):
+		"""
+		Function that returns the edges of the similarity graph as the arrays of their
+		source sentences, target sentences and weights.
+
+		Parameters:
+			1) sentences - the arrays of Vocabulary ids of the sentences to link
+			2) vocabulary - Vocabulary.Vocabulary the ids belong to
+		"""
+
+		np = self.numpy
+		count = len(sentences)
+		folded = vocabulary.folded
+		ignored = vocabulary.ignored
+		words = []
+		lengths = []
+
+		for sent in sentences:
+			#Words are compared by the id of their lowercase form
+			sent_words = {folded[token] for token in sent if not ignored[token]}
+			words.extend(sent_words)
+			lengths.append(len(sent_words))
+
+		#The words of every sentence one after the other, as dense word numbers
+		vocabulary_words, words = np.unique(np.array(words, dtype=np.int64), return_inverse=True)
+		words = words.ravel()
+		lengths = np.array(lengths, dtype=np.intp)
+		rows = np.repeat(np.arange(count, dtype=np.intp), lengths)
+
+		#The posting list of every word: the sentences it is in, one word after the other
+		postings = rows[np.argsort(words, kind="stable")]
+		sizes = np.bincount(words, minlength=len(vocabulary_words))
+		starts = np.cumsum(sizes) - sizes
+
+		#A sentence is linked to every sentence in the posting lists of its words
+		row_pairs = np.bincount(rows, weights=sizes[words], minlength=count).astype(np.int64)
+		row_ends = np.cumsum(row_pairs)
+		word_ends = np.cumsum(lengths)
+
+		sources = []
+		targets = []
+		overlap = []
+		first = 0
+
+		#Sentences are linked a few at a time so the pairs and counts fit in the budget
+		while first < count:
+			done = row_ends[first] - row_pairs[first]
+			last = int(np.searchsorted(row_ends, done + PAIR_BUDGET, side="right"))
+			last = max(first + 1, min(last, first + max(1, PAIR_BUDGET // count)))
+
+			block_words = words[word_ends[first] - lengths[first]:word_ends[last - 1]]
+			block_rows = rows[word_ends[first] - lengths[first]:word_ends[last - 1]] - first
+			block_sizes = sizes[block_words]
+
+			#Every (sentence, word) pair becomes one pair per sentence of the word's posting list
+			within = np.arange(block_sizes.sum()) - np.repeat(np.cumsum(block_sizes) - block_sizes, block_sizes)
+			block_targets = postings[np.repeat(starts[block_words], block_sizes) + within]
+			keys = np.repeat(block_rows, block_sizes) * count + block_targets
+
+			#The number of times a pair comes up is the number of words the two sentences share
+			shared = np.bincount(keys, minlength=(last - first) * count).reshape(last - first, count)
+			shared[np.arange(last - first), np.arange(first, last)] = 0
+
+			block_sources, block_targets = np.nonzero(shared)
+			sources.append((block_sources + first).astype(np.int32))
+			targets.append(block_targets.astype(np.int32))
+			overlap.append(shared[block_sources, block_targets].astype(np.int32))
+			first = last
+
+		sources = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int32)
+		targets = np.concatenate(targets) if targets else np.zeros(0, dtype=np.int32)
+		overlap = np.concatenate(overlap) if overlap else np.zeros(0, dtype=np.int32)
+
+		norm = np.log(lengths.astype(np.float64) + 1)
+		weights = overlap / (norm[sources] + norm[targets])
+
+		return sources, targets, weights
+
+
+	def scores(self, sentences, vocabulary):
+		"""
+		Function that returns the TextRank score of every sentence.
+
+		Parameters:
+			1) sentences - the arrays of Vocabulary ids of the sentences to score
+			2) vocabulary - Vocabulary.Vocabulary the ids belong to
+		"""
+
+		np = self.numpy
+		count = len(sentences)
+		sources, targets, weights = self.graph(sentences, vocabulary)
+
+		#Without any links every sentence is as central as the others
+		if not len(sources):
+			return np.full(count, 1.0 / count)
+
+		#Every sentence splits its score between its links in proportion to their weights
+		out = np.bincount(sources, weights=weights, minlength=count)
+		weights = weights / out[sources]
+		dangling = out == 0
+
+		scores = np.full(count, 1.0 / count)
+
+		for _ in range(self.max_iterations):
+			spread = np.bincount(targets, weights=weights * scores[sources], minlength=count)
+
+			#Sentences without links share their score with every sentence
+			spread += scores[dangling].sum() / count
+			new_scores = (1 - self.damping) / count + self.damping * spread
+
+			change = np.abs(new_scores - scores).sum()
+			scores = new_scores
+			if change < self.tolerance:
+				break
+
+		return scores
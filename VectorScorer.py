@@ -0,0 +1,100 @@
+class VectorScorer:
+	"""
+	Class that ranks sentences with NumPy instead of a Python loop over every word.
+
+	Every document becomes a sparse sentence x keyword count matrix, kept in coordinate
+	form as the row and column of every keyword occurence. Many documents are stacked
+	into one block diagonal matrix so a whole batch is scored with a single product.
+	The sentences come with the Vocabulary ids of all their words in one array, so the
+	keywords are found among all the words at once without a Python loop over the words.
+	"""
+
+	def __init__(self):
+		"""Initialization function for this class."""
+
+		#NumPy is only needed by the vectorized scoring, so only import it when it is used
+		import numpy
+
+		self.numpy = numpy
+
+
+	def matrix(self, sentences, keywords):
+		"""
+		Function that returns the rows and columns of the keyword occurences of a document.
+		Every (row, column) pair is one occurence of the keyword of that column in the
+		sentence of that row.
+
+		Parameters:
+			1) sentences - the Segmenter.Sentences of the document, tokenized
+			2) keywords - the Vocabulary ids of the keywords, in column order
+		"""
+
+		np = self.numpy
+		keywords = np.fromiter(keywords, dtype=np.uintc, count=len(keywords))
+
+		if not len(keywords):
+			return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+		#The array of ids is read by NumPy in place without going through Python ints
+		tokens = np.frombuffer(sentences.tokens, dtype=np.uintc)
+		lengths = np.diff(np.frombuffer(sentences.bounds, dtype=np.uintc).astype(np.intp))
+		rows = np.repeat(np.arange(len(sentences), dtype=np.intp), lengths)
+
+		#Look every word up among the sorted keywords, the words found are the keywords
+		order = np.argsort(keywords)
+		ordered = keywords[order]
+		positions = np.searchsorted(ordered, tokens).clip(max=len(keywords) - 1)
+		hits = ordered[positions] == tokens
+
+		return rows[hits], order[positions[hits]]
+
+
+	def rank(self, sentences, weights):
+		"""
+		Function that returns the rank of every sentence of one document.
+
+		Parameters:
+			1) sentences - the Segmenter.Sentences of the document, tokenized
+			2) weights - dict of the Vocabulary id of every keyword to the weight it adds to a sentence
+		"""
+
+		return self.rank_documents([(sentences, weights)])[0]
+
+
+	def rank_documents(self, documents):
+		"""
+		Function that returns the rank of every sentence of every document, scoring
+		the whole batch at once.
+
+		Parameters:
+			1) documents - list of (sentences, weights) tuples of tokenized Segmenter.Sentences and dicts of keyword id to weight
+		"""
+
+		if not documents:
+			return []
+
+		np = self.numpy
+		rows = []
+		cols = []
+		values = []
+		offsets = [0]
+		column_offset = 0
+
+		for sentences, weights in documents:
+			document_rows, document_cols = self.matrix(sentences, weights)
+
+			#Shift every document into its own block of rows and columns
+			rows.append(document_rows + offsets[-1])
+			cols.append(document_cols + column_offset)
+			values.append(np.fromiter(weights.values(), dtype=np.float64, count=len(weights)))
+
+			offsets.append(offsets[-1] + len(sentences))
+			column_offset += len(weights)
+
+		rows = np.concatenate(rows)
+		values = np.concatenate(values)[np.concatenate(cols)]
+
+		#Summing the weight of every occurence per row is the matrix times the weight vector
+		ranks = np.bincount(rows, weights=values, minlength=offsets[-1]).tolist()
+
+		return [ranks[start:end] for start, end in zip(offsets, offsets[1:])]
@@ -0,0 +1,68 @@
+from array import array
+
+class Vocabulary(dict):
+	"""
+	Class that gives every distinct word of a document a small integer id, so a sentence
+	is split once into an array of ids and every later stage compares integers instead
+	of splitting the sentence into new strings again. What the stages need to know about
+	a word is worked out once, when the word gets its id.
+
+	It is the dict of every word to its id, looking a new word up gives it the next id.
+	Every document has its own vocabulary that goes away with it, so memory is bounded
+	by the largest document and no lock is needed while the sentences are tokenized.
+	"""
+
+	def __init__(self, ignored_words=frozenset()):
+		"""
+		Initialization function for this class.
+
+		Parameters:
+			1) ignored_words - set of words that are never keywords
+		"""
+
+		super().__init__()
+		self.ignored_words = ignored_words
+		self.words = []
+
+		#For every id, whether the word can be a keyword, whether it is ignored and the id of its lowercase form
+		self.candidates = bytearray()
+		self.ignored = bytearray()
+		self.folded = array("I")
+
+
+	def __missing__(self, word):
+		"""
+		Function that gives a new word the next id and returns it.
+
+		Parameters:
+			1) word - the word to add
+		"""
+
+		lowered = word.lower()
+		folded = self[lowered] if lowered != word else len(self.words)
+
+		token = len(self.words)
+		self.words.append(word)
+		self.candidates.append(word not in self.ignored_words and word[0].isupper())
+		self.ignored.append(word in self.ignored_words)
+		self.folded.append(folded)
+		self[word] = token
+
+		return token
+
+
+	def tokenize(self, texts, tokens, bounds):
+		"""
+		Function that splits texts on whitespace and adds the ids of their words to one
+		array, with where the words of every text end to another.
+
+		Parameters:
+			1) texts - the texts to split
+			2) tokens - array('I') the ids of the words are added to
+			3) bounds - array('I') the number of ids in tokens after every text is added to
+		"""
+
+		#Words already seen are looked up without leaving C, only new words run __missing__
+		for text in texts:
+			tokens.extend(map(self.__getitem__, text.split()))
+			bounds.append(len(tokens))
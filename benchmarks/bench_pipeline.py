@@ -0,0 +1,209 @@
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexicons import Replacer
+from Summarizer import Summarizer
+from TextExtractor import EXTRACTORS, parse_page
+from make_corpus import CORPUS_DIR, make_corpus
+
+def load_engine():
+	"""
+	Function that returns the Summarizer to benchmark, using the project lexicons when they
+	can be found from the working directory and empty ones otherwise.
+	"""
+
+	try:
+		return Summarizer()
+	except OSError:
+		print("Lexicons not found, benchmarking with empty ones", file=sys.stderr)
+		return Summarizer(ignored_words=frozenset(), replacer=Replacer({}))
+
+
+def measure(function, value, repeat):
+	"""
+	Function that times a stage and measures its peak memory.
+	Returns the best time in seconds, the peak traced bytes and the stage output.
+
+	Parameters:
+		1) function - the stage to run
+		2) value - the input of the stage
+		3) repeat - how many times the stage is timed
+	"""
+
+	best = None
+
+	for _ in range(repeat):
+		start = time.perf_counter()
+		output = function(value)
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+
+	#Memory is traced in its own run since tracing slows the stage down
+	tracemalloc.start()
+	function(value)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return best, peak, output
+
+
+def size_of(value):
+	"""
+	Function that returns the number of characters and items in a stage output.
+
+	Parameters:
+		1) value - the stage output
+	"""
+
+	if isinstance(value, str):
+		return len(value), None
+
+	return sum(len(str(item)) for item in value), len(value)
+
+
+def run(paths, extractors, repeat):
+	"""
+	Function that benchmarks every stage on every page and returns the records.
+	Each stage is given the output of the stage before it.
+
+	Parameters:
+		1) paths - the saved pages
+		2) extractors - names of the extractor backends to benchmark
+		3) repeat - how many times each stage is timed
+	"""
+
+	engine = load_engine()
+	records = []
+
+	for path in paths:
+		with open(path, "rb") as f:
+			html = f.read()
+
+		def stage(name, function, value):
+			seconds, peak, output = measure(function, value, repeat)
+			chars, items = size_of(output)
+			records.append({
+				"page": os.path.basename(path),
+				"page_bytes": len(html),
+				"stage": name,
+				"seconds": seconds,
+				"peak_bytes": peak,
+				"output_chars": chars,
+				"output_items": items,
+				"mb_per_second": len(html) / seconds / 1e6 if seconds else None,
+			})
+			return output
+
+		for extractor in extractors:
+			text = stage("parse_" + extractor, lambda html: parse_page(html, extractor).text, html)
+
+		cleaned = stage("clean_text", engine.clean, text)
+		stage("add_spaces", engine.add_spaces, cleaned.splitlines())
+		sentences = stage("split_text", lambda text: engine.split_text(engine.mark_end_of_paragraphs(text)), cleaned)
+		keywords = stage("grab_keywords", engine.grab_keywords, sentences)
+		best = stage("rank_sentences", lambda sentences: engine.rank_sentences(sentences, keywords), sentences)
+		stage("group_summary", engine.group_summary, [str(sentences[index]) for index in best])
+		stage("summarize", engine.summarize, text)
+
+	return records
+
+
+def compare(records, baseline, threshold):
+	"""
+	Function that prints how every stage moved against a baseline run.
+	Returns the number of stages slower than the threshold allows.
+
+	Parameters:
+		1) records - the records of this run
+		2) baseline - the records of the baseline run
+		3) threshold - allowed slowdown, 0.1 allows stages to be 10% slower
+	"""
+
+	old = {(record["page"], record["stage"]): record for record in baseline}
+	regressions = 0
+
+	for record in records:
+		before = old.get((record["page"], record["stage"]))
+		if not before or not before["seconds"]:
+			continue
+
+		ratio = record["seconds"] / before["seconds"]
+		flag = ""
+		if ratio > 1 + threshold:
+			flag = "  REGRESSION"
+			regressions += 1
+
+		print("{:<28}{:<24}{:>8.2f}x time{:>8.2f}x memory{}".format(record["page"], record["stage"], ratio, record["peak_bytes"] / max(before["peak_bytes"], 1), flag))
+
+	return regressions
+
+
+def report(records):
+	"""
+	Print a table of the records.
+
+	Parameters:
+		1) records - the records to print
+	"""
+
+	print("{:<28}{:>10}  {:<24}{:>12}{:>14}{:>10}".format("page", "KiB", "stage", "ms", "peak KiB", "MB/s"))
+	for record in records:
+		print("{:<28}{:>10.0f}  {:<24}{:>12.3f}{:>14.1f}{:>10.1f}".format(
+			record["page"], record["page_bytes"] / 1024, record["stage"], record["seconds"] * 1000,
+			record["peak_bytes"] / 1024, record["mb_per_second"] or 0))
+
+
+def main():
+	"""Driver function to benchmark every stage of the pipeline on the saved corpus."""
+	parser = argparse.ArgumentParser(description="Benchmark every stage of the summarizing pipeline without network access.")
+	parser.add_argument("--corpus", default=CORPUS_DIR, help="directory of saved .html pages")
+	parser.add_argument("--repeat", type=int, default=5, help="how many times each stage is timed, the best time is kept")
+	parser.add_argument("--extractor", action="append", choices=sorted(EXTRACTORS), help="extractor backends to benchmark, all that can be imported by default")
+	parser.add_argument("--output", help="write the results as JSON to this file")
+	parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare against")
+	parser.add_argument("--threshold", type=float, default=0.1, help="slowdown against the baseline that counts as a regression")
+	args = parser.parse_args()
+
+	extractors = args.extractor
+	if not extractors:
+		extractors = ["stream"]
+		try:
+			import bs4
+			extractors.insert(0, "soup")
+		except ImportError:
+			print("BeautifulSoup not installed, skipping the soup extractor", file=sys.stderr)
+
+	if args.corpus == CORPUS_DIR:
+		make_corpus()
+
+	paths = sorted(glob.glob(os.path.join(args.corpus, "*.html")), key=os.path.getsize)
+	records = run(paths, extractors, args.repeat)
+	report(records)
+
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as f:
+			json.dump({
+				"python": platform.python_version(),
+				"platform": platform.platform(),
+				"date": datetime.datetime.now().isoformat(),
+				"records": records,
+			}, f, indent=1)
+
+	if args.compare:
+		with open(args.compare, "r", encoding="utf-8") as f:
+			baseline = json.load(f)["records"]
+		print()
+		if compare(records, baseline, args.threshold):
+			exit(1)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,141 @@
+import argparse
+import os
+import random
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+#Approximate size in bytes of every generated page
+SIZES = {
+	"small": 20 * 1024,
+	"medium": 150 * 1024,
+	"large": 1024 * 1024,
+	"huge": 4 * 1024 * 1024,
+}
+
+WORDS = ("the of and in to a was is for on as by with he that at from his it an were are which "
+	"this also be or had first one their its new after but who not they have her she two been "
+	"other when there all during into school time may years more most only over city some world "
+	"would where later up such used many can state about national out known university united "
+	"then made series while government early since century war film season team league army "
+	"river island church music album game party council station house population village").split()
+
+NAMES = ("Python London Paris Rossum Amsterdam Netherlands England France Europe America Smith "
+	"Johnson Williams Brown Jones Miller Davis Wilson Anderson Taylor Thomas Moore Martin Jackson "
+	"Thompson White Harris Clark Lewis Robinson Walker Young Allen King Wright Scott Green Baker").split()
+
+ABBREVIATIONS = ["Mr.", "Mrs.", "Dr.", "St.", "Jr.", "e.g.", "i.e."]
+
+def sentence(rng):
+	"""
+	Function that returns one random sentence.
+
+	Parameters:
+		1) rng - random.Random to draw from
+	"""
+
+	words = []
+
+	for _ in range(rng.randint(12, 40)):
+		draw = rng.random()
+		if draw < 0.15:
+			words.append(rng.choice(NAMES))
+		elif draw < 0.17:
+			words.append(rng.choice(ABBREVIATIONS) + " " + rng.choice(NAMES))
+		else:
+			words.append(rng.choice(WORDS))
+
+	words[0] = words[0][0].upper() + words[0][1:]
+	return " ".join(words) + rng.choice([".", ".", ".", ".", "?", "!"])
+
+
+def paragraph(rng):
+	"""
+	Function that returns one random paragraph with the inline markup wiki pages have.
+
+	Parameters:
+		1) rng - random.Random to draw from
+	"""
+
+	sentences = []
+
+	for _ in range(rng.randint(2, 8)):
+		text = sentence(rng)
+		if rng.random() < 0.3:
+			name = rng.choice(NAMES)
+			text = text.replace(name, '<a href="/wiki/{0}" title="{0}">{0}</a>'.format(name), 1)
+		if rng.random() < 0.2:
+			text += '<sup class="reference"><a href="#cite_note-{0}">[{0}]</a></sup>'.format(rng.randint(1, 200))
+		sentences.append(text)
+
+	return "<p>" + " ".join(sentences) + "</p>\n"
+
+
+def page(title, size, seed):
+	"""
+	Function that returns a wiki-like page of about the given size.
+
+	Parameters:
+		1) title - title of the article
+		2) size - approximate size of the page in bytes
+		3) seed - seed that makes the page reproducible
+	"""
+
+	rng = random.Random(seed)
+	parts = [
+		"<!DOCTYPE html>\n<html><head><title>{} - Wikipedia</title>\n".format(title),
+		'<link rel="canonical" href="https://en.wikipedia.org/wiki/{}">\n'.format(title),
+		"<style>.mw-body{margin:0}" + ".x{color:red}" * 200 + "</style>\n",
+		"<script>var config = {" + '"k":"v. w",' * 300 + "};</script>\n",
+		'</head><body><div id="content"><h1>{}</h1>\n'.format(title),
+		'<table class="infobox"><tr><th>Born</th><td>1956</td></tr><tr><th>Known for</th><td>Python</td></tr></table>\n',
+	]
+	length = sum(len(part) for part in parts)
+	section = 0
+
+	while length < size:
+		if rng.random() < 0.1:
+			section += 1
+			part = "<h2>Section {}</h2>\n".format(section)
+		elif rng.random() < 0.05:
+			part = "<ul>" + "".join("<li>{}</li>".format(sentence(rng)) for _ in range(5)) + "</ul>\n"
+		else:
+			part = paragraph(rng)
+		parts.append(part)
+		length += len(part)
+
+	parts.append('<ol class="references">' + "<li>Reference.</li>" * 50 + "</ol>\n")
+	parts.append("<script>window.RLQ=[];</script></div></body></html>\n")
+
+	return "".join(parts)
+
+
+def make_corpus(directory=CORPUS_DIR):
+	"""
+	Write every synthetic page that is missing from the corpus directory.
+
+	Parameters:
+		1) directory - the corpus directory
+	"""
+
+	os.makedirs(directory, exist_ok=True)
+
+	for seed, (name, size) in enumerate(sorted(SIZES.items(), key=lambda item: item[1])):
+		path = os.path.join(directory, "synthetic_{}.html".format(name))
+		if not os.path.exists(path):
+			with open(path, "w", encoding="utf-8") as f:
+				f.write(page("Synthetic_" + name, size, seed))
+
+
+def main():
+	"""
+	Driver function to write the synthetic corpus, pages that let the benchmarks run
+	without any network access. Saved real pages can be dropped into the same directory.
+	"""
+	parser = argparse.ArgumentParser(description="Write the synthetic benchmark pages.")
+	parser.add_argument("--corpus", default=CORPUS_DIR, help="directory to write the pages to")
+	args = parser.parse_args()
+
+	make_corpus(args.corpus)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DocumentFrequency import DocumentFrequency
+from HashSet import HashSet, key_hash
+
+class DocumentFrequencyTest(unittest.TestCase):
+	"""Class that checks every document is counted once, however often it is added."""
+
+	def test_documents_counted_once(self):
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "df")
+			index = DocumentFrequency(path, buckets=1 << 12)
+
+			self.assertTrue(index.add_document(["Alpha", "Beta"], "https://en.wikipedia.org/wiki/Alpha"))
+			self.assertFalse(index.add_document(["Alpha", "Gamma"], "https://en.wikipedia.org/wiki/Alpha"))
+			self.assertTrue(index.add_document(["Beta", "Alpha"]))
+			self.assertFalse(index.add_document(["Alpha", "Beta", "Alpha"]))
+			self.assertFalse(index.add_document([], "https://en.wikipedia.org/wiki/Empty"))
+
+			self.assertEqual(index.documents, 2)
+			self.assertEqual(index.frequency("Alpha"), 2)
+			self.assertEqual(index.frequency("Gamma"), 0)
+			index.close()
+
+			#The documents already counted are remembered by the next run
+			index = DocumentFrequency(path)
+			self.assertFalse(index.add_document(["Delta"], "https://en.wikipedia.org/wiki/Alpha"))
+			self.assertTrue(index.add_document(["Delta"], "https://en.wikipedia.org/wiki/Delta"))
+			self.assertEqual(index.documents, 3)
+			index.close()
+
+
+class HashSetTest(unittest.TestCase):
+	"""Class that checks HashSet against a set while it grows."""
+
+	def test_against_set(self):
+		hashes = HashSet(4)
+		expected = set()
+
+		for i in range(5000):
+			value = key_hash(str(i % 3000))
+			self.assertEqual(hashes.add(value), value not in expected)
+			expected.add(value)
+
+		self.assertEqual(len(hashes), len(expected))
+		for i in range(6000):
+			self.assertEqual(key_hash(str(i)) in hashes, i < 3000)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,119 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DocumentFrequency import DocumentFrequency
+from IncrementalSummarizer import IncrementalSummarizer
+from Lexicons import Replacer
+from Summarizer import Summarizer
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+WORDS = "Alpha Beta Gamma Delta the a Eps Zeta eta theta Iota Mr. Dr. kappa lambda mu".split()
+IGNORED_WORDS = frozenset(["The", "the", "A", "a"])
+REPLACER = Replacer({"Mr.": "Mr", "Dr.": "Dr"})
+
+class IncrementalSummarizerTest(unittest.TestCase):
+	"""
+	Class that checks IncrementalSummarizer gives the same summaries as Summarizer over
+	random sequences of edits: replaced, inserted, deleted and duplicated paragraphs.
+	"""
+
+	def sentence(self, rng):
+		"""Function that returns a random sentence."""
+
+		return " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 35))) + rng.choice(".!?")
+
+
+	def paragraph(self, rng):
+		"""Function that returns a random paragraph."""
+
+		return " ".join(self.sentence(rng) for _ in range(rng.randint(1, 4)))
+
+
+	def check(self, make_summarizer, seed=3, revisions=60, max_words=1 << 16):
+		"""
+		Edit random articles and compare the two summaries of every revision.
+
+		Parameters:
+			1) make_summarizer - function returning a new Summarizer for a keyword limit and sentence limit
+			2) seed - seed of the random edits
+			3) revisions - edits made to every article
+			4) max_words - most words the incremental vocabulary holds before it can be dropped
+		"""
+
+		rng = random.Random(seed)
+
+		for keyword_limit in (3, 10, 25):
+			sentence_limit = rng.choice([0.3, 0.65])
+			reference = make_summarizer(keyword_limit, sentence_limit)
+			incremental = IncrementalSummarizer(make_summarizer(keyword_limit, sentence_limit), max_words)
+			paragraphs = [self.paragraph(rng) for _ in range(20)]
+
+			for revision in range(revisions):
+				op = rng.random()
+				i = rng.randrange(len(paragraphs))
+
+				if op < 0.4:
+					paragraphs[i] = self.paragraph(rng)
+				elif op < 0.6:
+					paragraphs.insert(i, self.paragraph(rng))
+				elif op < 0.75 and len(paragraphs) > 1:
+					del paragraphs[i]
+				elif op < 0.85:
+					paragraphs.insert(i, paragraphs[rng.randrange(len(paragraphs))])
+
+				text = "\n".join(paragraphs)
+				self.assertEqual(incremental.summarize(text), reference.summarize(text), "revision {}".format(revision))
+
+
+	def summarizer(self, keyword_limit, sentence_limit, **options):
+		"""Function that returns a Summarizer with the test lexicons."""
+
+		return Summarizer(None, keyword_limit, sentence_limit, ignored_words=IGNORED_WORDS, replacer=REPLACER, **options)
+
+
+	def test_count(self):
+		self.check(self.summarizer)
+
+
+	def test_cleared_vocabulary(self):
+		#The first revision already has more words than this, so the second one starts from scratch
+		self.check(self.summarizer, revisions=30, max_words=8)
+
+
+	def test_tfidf(self):
+		#Each side has its own index so both see the same documents in the same order
+		with tempfile.TemporaryDirectory() as directory:
+			indexes = []
+
+			def make_summarizer(keyword_limit, sentence_limit):
+				index = DocumentFrequency(os.path.join(directory, "df{}".format(len(indexes))), buckets=1 << 12)
+				indexes.append(index)
+				return self.summarizer(keyword_limit, sentence_limit, scoring="tfidf", df_index=index)
+
+			try:
+				self.check(make_summarizer, revisions=30)
+			finally:
+				for index in indexes:
+					index.close()
+
+
+	@unittest.skipIf(numpy is None, "TextRank needs NumPy")
+	def test_textrank(self):
+		self.check(lambda keyword_limit, sentence_limit: self.summarizer(keyword_limit, sentence_limit, ranking="textrank"), revisions=30)
+
+
+	@unittest.skipIf(numpy is None, "the vectorized scorer needs NumPy")
+	def test_vectorized(self):
+		self.check(lambda keyword_limit, sentence_limit: self.summarizer(keyword_limit, sentence_limit, vectorized=True), revisions=30)
+
+if __name__ == "__main__":
+	unittest.main()
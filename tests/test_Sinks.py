@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Sinks import FileSink, Result, output_path
+
+TITLES = ["C", "C++", "C#", "C_", "C ", "F#", "F*", "a/b", "a_b", ".", "..", "%2E", "untitled", "", "Zürich", "x" * 300, "x" * 299 + "y"]
+
+class OutputPathTest(unittest.TestCase):
+	"""Class that checks different titles are written to different summary files."""
+
+	def test_unique(self):
+		paths = [output_path("d", title) for title in TITLES if title]
+		self.assertEqual(len(set(paths)), len(paths))
+
+
+	def test_inside_directory(self):
+		for title in TITLES:
+			path = output_path("d", title)
+			self.assertEqual(os.path.dirname(path), "d")
+			self.assertLessEqual(len(os.path.basename(path).encode("utf-8")), 255)
+			self.assertFalse(os.path.basename(path).startswith("."))
+
+
+	def test_no_clobbering(self):
+		with tempfile.TemporaryDirectory() as directory:
+			sink = FileSink(directory)
+			for title in TITLES:
+				if title:
+					sink.write(Result(title, None, ["Summary of " + title], title))
+
+			self.assertEqual(len(os.listdir(directory)), len([title for title in TITLES if title]))
+
+if __name__ == "__main__":
+	unittest.main()